@@ -28,6 +28,11 @@ from utils.csvlog import (
     get_tunnel_logdays
 )
 
+from utils.limits import (
+    bounded,
+    gather_bounded
+)
+
 from utils.samples import (
     get_columns_from_csv
 )
@@ -99,7 +104,7 @@ async def get_sample_pool(
         
     t = pd.DatetimeIndex(t).tz_localize(logtz, ambiguous = 'NaT')
 
-    sbsb *=100
+    sbsb = sbsb*100
     
     df = pd.DataFrame(
         data = {
@@ -155,7 +160,7 @@ async def get_sky_pool(
 ) -> Optional[pd.DataFrame]:
     
     sky = Sky(lat,lon, logday, tz)
-    df = await sky.get_ai_feature_info()
+    df = await bounded('http', sky.get_ai_feature_info())
     if df is None:
         logger.error(f'No sky features for {logday}')
         return None
@@ -240,15 +245,11 @@ async def get_train_pools(
     ))
     logger.info(f'Window "{logwindow}" meets "{len(logdays)}" days')
     
-    pool_tasks = [
-        asyncio.create_task(
-            get_train_pool(
-                logdir,logprefix,ld,tz,lat,lon
-            )
-        ) for ld in logdays]
-    
     """ Get the list of associated columns """
-    pool_frames = await asyncio.gather(*pool_tasks)
+    pool_frames = await gather_bounded('cpu', [
+        get_train_pool(
+            logdir,logprefix,ld,tz,lat,lon
+        ) for ld in logdays])
 
     try:
         pool = pd.concat(pool_frames)
@@ -23,12 +23,16 @@ from dataclasses import dataclass
 from aicast.train_models import (
     train_models
 )
+from utils.csvlog import (
+    set_log_workers
+)
 
 MODELDIR='/home/r09491/storage/solar_checker/aicast/models'
 
 LOGDIR='/home/r09491/storage/solar_checker'
 LOGPREFIX='solar_checker_latest'
 LOGAIWINDOW=28
+LOGWORKERS=0
 
 LAT, LON, TZ = 49.04885, 11.78333, 'Europe/Berlin'
 
@@ -38,6 +42,7 @@ class Script_Arguments:
     logdir:str
     logprefix:str
     logaiwindow:int
+    logworkers:int
     tz:str
     lat:float
     lon:float
@@ -68,6 +73,10 @@ def parse_arguments() -> Script_Arguments:
         '--logaiwindow', type=int, default=LOGAIWINDOW,
         help = "Days to select files for the pools"
     )
+    parser.add_argument(
+        '--logworkers', type=int, default=LOGWORKERS,
+        help = "Processes to parse log files in parallel"
+    )
     parser.add_argument(
         '--tz', type = str, default=TZ,
         help = "TZ for forecast"
@@ -88,6 +97,7 @@ def parse_arguments() -> Script_Arguments:
         args.logdir,
         args.logprefix,
         args.logaiwindow,
+        args.logworkers,
         args.tz,
         args.lat,
         args.lon)
@@ -128,6 +138,8 @@ if __name__ == "__main__":
         logger.error(f'The longitude is out of range  "{args.lon}"')
         sys.exit(2)
 
+    set_log_workers(args.logworkers)
+
     try:
         err = asyncio.run(
             main(
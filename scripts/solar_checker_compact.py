@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+__doc__=""" Compacts the log files of closed days. The log files older
+than the kept days are compressed. With merge all days of a closed
+month are put into one archive. The server and the scripts read the
+compacted log files transparently.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import sys
+import argparse
+
+from dataclasses import dataclass
+
+from utils.csvlog import (
+    compact_logs
+)
+
+LOGDIR='/home/r09491/storage/solar_checker'
+LOGPREFIX='solar_checker_latest'
+LOGKEEPDAYS=7
+
+@dataclass
+class Script_Arguments:
+    logdir:str
+    logprefix:str
+    logkeepdays:int
+    merge:bool
+
+def parse_arguments() -> Script_Arguments:
+    """Parse command line arguments"""
+
+    parser = argparse.ArgumentParser(
+        prog=os.path.basename(sys.argv[0]),
+        description='Compact the log files of closed days',
+        epilog=__doc__)
+
+    parser.add_argument('--version', action = 'version', version = __version__)
+
+    parser.add_argument(
+        '--logdir', type=str, default=LOGDIR,
+        help = "Directory with the log files")
+
+    parser.add_argument(
+        '--logprefix', type=str, default=LOGPREFIX,
+        help = "Prefix of the log files")
+
+    parser.add_argument(
+        '--logkeepdays', type=int, default=LOGKEEPDAYS,
+        help = "Number of recent days to keep uncompressed")
+
+    parser.add_argument(
+        '--merge', action='store_true',
+        help = "Merge the days of closed months into one archive")
+
+    args = parser.parse_args()
+
+    return Script_Arguments(
+        args.logdir,
+        args.logprefix,
+        args.logkeepdays,
+        args.merge
+    )
+
+
+def main(args: Script_Arguments) -> int:
+    failed = compact_logs(
+        args.logprefix,
+        args.logdir,
+        args.logkeepdays,
+        args.merge
+    )
+    if failed > 0:
+        logger.error(f'"{failed}" log files not compacted')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    args = parse_arguments()
+
+    logger.info(f'Compaction started')
+    try:
+        err = main(args)
+    except KeyboardInterrupt:
+        err = 99
+    logger.info(f'Compaction done (err={err})')
+    sys.exit(err)
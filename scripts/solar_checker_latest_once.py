@@ -12,8 +12,10 @@ __author__ = "r09491@gmail.com"
 
 import os
 import sys
+import json
 import argparse
 import asyncio
+import tempfile
 
 from datetime import datetime
 
@@ -34,6 +36,20 @@ logging.basicConfig(
 logger = logging.getLogger(os.path.basename(__name__))
 
 
+""" The names and types of the columns in the recording file. The
+order must match the order of the results in 'main' """
+SCHEMA_VERSION = 1
+SCHEMA_NAMES = [
+    'TIME',
+    'SMP', 'SME',
+    'IVP1', 'IVE1', 'IVTE1',
+    'IVP2', 'IVE2', 'IVTE2',
+    'SPPH', 'SBPI', 'SBPO', 'SBPB', 'SBSB',
+    'SPP1', 'SPP2', 'SPP3', 'SPP4'
+]
+SCHEMA_TYPES = ['datetime'] + (len(SCHEMA_NAMES) - 1)*['float64']
+
+
 async def anker_solarbank_latest_get(sb: Solarbank) -> str:
     logger.info(f'anker_solarbank_latest_get started')
     text = '0.000,0.000,0.000,0.00'
@@ -164,6 +180,29 @@ async def main(sm: Smartmeter, iv: Inverter,
     return 0
 
 
+""" Write the schema of the recording file once. The readers parse
+the recording file with the names and types of the schema """
+def write_schema(schema: str) -> None:
+    if os.path.isfile(schema):
+        return
+
+    tempname = None
+    try:
+        fd, tempname = tempfile.mkstemp(
+            suffix='.tmp', dir=os.path.dirname(schema) or '.'
+        )
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'version': SCHEMA_VERSION,
+                       'names': SCHEMA_NAMES,
+                       'types': SCHEMA_TYPES}, f)
+        os.chmod(tempname, 0o644)
+        os.replace(tempname, schema)
+    except OSError:
+        logger.warning(f'Cannot write schema "{schema}"')
+        if tempname is not None and os.path.isfile(tempname):
+            os.remove(tempname)
+
+
 @dataclass
 class Script_Arguments:
     sm_ip: str
@@ -175,6 +214,7 @@ class Script_Arguments:
     sp_switch_2: str
     sp_switch_3: str
     sp_switch_4: str
+    schema: str
     
 def parse_arguments() -> Script_Arguments:
     """Parse command line arguments"""
@@ -212,6 +252,9 @@ def parse_arguments() -> Script_Arguments:
 
     parser.add_argument('--sp_switch_4', type = str, default = None,
                         help = "Name of the plug used as switch 4")
+
+    parser.add_argument('--schema', type = str, default = None,
+                        help = "Path of the schema of the recording file")
     
     args = parser.parse_args()
     
@@ -219,7 +262,8 @@ def parse_arguments() -> Script_Arguments:
                             args.iv_ip, args.iv_port,
                             args.sp_balcony,
                             args.sp_switch_1, args.sp_switch_2,
-                            args.sp_switch_3, args.sp_switch_4)
+                            args.sp_switch_3, args.sp_switch_4,
+                            args.schema)
 
 
 if __name__ == '__main__':
@@ -266,6 +310,10 @@ if __name__ == '__main__':
     sp2 = Smartplug(args.sp_switch_2) if args.sp_switch_2 is not None else None
     sp3 = Smartplug(args.sp_switch_3) if args.sp_switch_3 is not None else None
     sp4 = Smartplug(args.sp_switch_4) if args.sp_switch_4 is not None else None
+
+    if args.schema is not None:
+        write_schema(args.schema)
+
     err = asyncio.run(main(sm, iv, sph, sb, sp1, sp2, sp3, sp4))
 
     logger.info(f'Recording latest done (err={err})')
@@ -11,7 +11,8 @@ solar_checker_latest_once.py --iv_ip apsystems \
 			     --sm_ip tasmota \
 			     --sp_switch_3 "plug3" \
 			     --sp_switch_2 "plug2" \
-			     --sp_switch_1 "plug1" >> \
+			     --sp_switch_1 "plug1" \
+			     --schema $SOLAR_CHECKER_STORE_DIR/solar_checker_latest_$(date +\%y\%m\%d).schema >> \
 			$SOLAR_CHECKER_STORE_DIR/solar_checker_latest_$(date +\%y\%m\%d).log 2>> \
 			$SOLAR_CHECKER_STORE_DIR/solar_checker_error_$(date +\%y\%m\%d).log
 
@@ -24,6 +24,7 @@ import matplotlib.image as mpimg
 from dataclasses import dataclass
 
 from utils.typing import f64, f64s, t64, t64s, strings, Any
+from utils.csvlog import get_logdays
 from utils.samples import get_columns_from_csv
 from utils.plots import get_blocks, get_w_line, get_kwh_line
 
@@ -141,9 +142,8 @@ async def save_powers(logday: str,
         logger.error(f'"{logprefix}" is not a logprefix')
         return 14
         
-    logfile = os.path.join(logdir, f'{logprefix}_{logday}.log' )
-    if not os.path.isfile(logfile):
-        logger.error(f'"{logfile}" is not a file')
+    if logday not in await get_logdays(logprefix, logdir, logday):
+        logger.error(f'"{logday}" is not a logday of "{logprefix}"')
         return 15
     
 
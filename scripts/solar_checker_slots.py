@@ -7,6 +7,10 @@ night slots. The start hours for the slots are 07:00, 10:00, 14:00,
 hour of the next slot. The start hours can be modified on the command
 line.
 
+A single day is read from stdin. With a range of logdays the
+statistics are calculated over all days of the range from the minute
+archive.
+
 This may be used to plan time slots for my Anker Solix 1600.
 """
 __version__ = "0.0.0"
@@ -31,8 +35,9 @@ from datetime import datetime, timedelta
 
 from dataclasses import dataclass
 
-from utils.typing import t64, t64s, timeslots, Any, List
-from utils.samples import get_columns_from_csv
+from utils.typing import t64, t64s, timeslots, Any, List, Optional
+from utils.csvlog import get_logdays
+from utils.samples import get_columns_from_csv, get_slot_stats
 
 
 import logging
@@ -99,6 +104,34 @@ async def show_slots(
     return 0
 
 
+async def show_slots_days(
+        slots: List[str],
+        times: List[str],
+        from_day: str,
+        to_day: str,
+        logprefix: str,
+        logdir: str
+) -> int:
+    logdays = [
+        ld for ld in await get_logdays(logprefix, logdir, '*')
+        if (from_day <= ld) and (ld <= to_day)
+    ]
+    if len(logdays) == 0:
+        logger.error("Missing logs in range!")
+        return -1
+
+    sdf = await get_slot_stats(logdays, times, logprefix, logdir)
+    if sdf is None:
+        logger.error("Missing samples in range!")
+        return -2
+    sdf.index = slots
+
+    print(f'\nSlots for "{logdays[0]}" to "{logdays[-1]}" ({len(logdays)} days)')
+    print(sdf)
+
+    return 0
+
+
 # def hm2time(hm: str) -> t64s:
 #     return t64(datetime.strptime(hm, "%H:%M"))
 def hm2time(hm: str) -> str:
@@ -114,6 +147,10 @@ class Script_Arguments:
     evening: str
     night: str
     daystop: str
+    from_day: Optional[str]
+    to_day: Optional[str]
+    logprefix: Optional[str]
+    logdir: Optional[str]
 
 def parse_args() -> Script_Arguments:
     description='Show some statistics for time slots'
@@ -142,7 +179,27 @@ def parse_args() -> Script_Arguments:
         '--night', type=hm2time, default = "22:30",
         help = "The start hour of the midnight slot")
 
+    parser.add_argument(
+        '--from_day', type=str, default = None,
+        help = "The first logday 'ymd' of a range instead of stdin")
+
+    parser.add_argument(
+        '--to_day', type=str, default = None,
+        help = "The last logday 'ymd' of the range. Default is the first")
+
+    parser.add_argument(
+        '--logprefix', type=str, default = None,
+        help = "Prefix of the log files of the range")
+
+    parser.add_argument(
+        '--logdir', type=str, default = None,
+        help = "Directory of the log files of the range")
+
     args = parser.parse_args()
+
+    if (args.from_day is not None) and (
+            (args.logprefix is None) or (args.logdir is None)):
+        parser.error('A range of logdays requires --logprefix and --logdir')
     
     return Script_Arguments(hm2time("00:00"),
                             args.morning,
@@ -150,7 +207,11 @@ def parse_args() -> Script_Arguments:
                             args.afternoon,
                             args.evening,
                             args.night,
-                            hm2time("23:59"))
+                            hm2time("23:59"),
+                            args.from_day,
+                            args.to_day or args.from_day,
+                            args.logprefix,
+                            args.logdir)
 
 
 async def main() -> int:
@@ -177,7 +238,14 @@ async def main() -> int:
     ]
 
     try:
-        await show_slots( slots[:-1], times)
+        if args.from_day is None:
+            await show_slots( slots[:-1], times)
+        else:
+            await show_slots_days(
+                slots[:-1], times,
+                args.from_day, args.to_day,
+                args.logprefix, args.logdir
+            )
     except KeyboardInterrupt:
         pass
     
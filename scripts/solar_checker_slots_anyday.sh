@@ -3,7 +3,16 @@
 #TASMOTA=$SOLAR_CHECKER_STORE_DIR/tasmota_latest_$1.log
 #APSYSTEMS=$SOLAR_CHECKER_STORE_DIR/apsystems_latest_$1.log
 #paste -d',' $TASMOTA $APSYSTEMS|solar_checker_plot.py --price 0.369
-SOLAR_CHECKER=$SOLAR_CHECKER_STORE_DIR/solar_checker_latest_$1.log
-cat $SOLAR_CHECKER|solar_checker_slots.py
+LOGDAY=$1
+SOLAR_CHECKER=$SOLAR_CHECKER_STORE_DIR/solar_checker_latest_$LOGDAY.log
+# Compacted days are read from their gzip file or their month archive
+if [ -f $SOLAR_CHECKER ]; then
+    cat $SOLAR_CHECKER
+elif [ -f $SOLAR_CHECKER.gz ]; then
+    zcat $SOLAR_CHECKER.gz
+else
+    unzip -p $SOLAR_CHECKER_STORE_DIR/solar_checker_latest_${LOGDAY:0:4}.zip \
+	  solar_checker_latest_$LOGDAY.log
+fi|solar_checker_slots.py
 
 
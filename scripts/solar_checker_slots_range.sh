@@ -0,0 +1,6 @@
+#!/bin/bash -l
+
+solar_checker_slots.py \
+    --from_day $1 --to_day $2 \
+    --logprefix solar_checker_latest \
+    --logdir $SOLAR_CHECKER_STORE_DIR
@@ -0,0 +1,167 @@
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+__doc__=""" Answers conditional requests of the views which opt in. The
+views provide the version of the log files they show. The ETag and the
+Last-Modified header are derived from it. A browser with the current
+version gets a 304 Not Modified without the view being run.
+
+The version also holds the conf entries the views draw with and the
+digest of the code, so a new price or a new plot is fetched again.
+Closed days, months and years may be kept by the browser for the
+lifetime of the view. Open ones are validated on each request.
+"""
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import glob
+import time
+import hashlib
+
+from email.utils import formatdate
+
+from aiohttp import web
+
+from utils.typing import (
+    Any, strings
+)
+from utils.csvlog import (
+    get_logdays,
+    get_logmtimes
+)
+
+""" The images of closed periods only change if their log files are
+replaced. The pages also show the menus with the latest log days, so
+they are kept for a shorter time. """
+IMAGE_MAX_AGE = 7*86400
+PAGE_MAX_AGE = 3600
+
+""" The pages change with the templates of a new start """
+STARTED = time.time_ns()
+
+""" The conf entries the views draw with """
+VIEW_CONF_KEYS = ['energy_price', 'battery_full_wh', 'battery_min_percent', 'tz']
+
+
+""" Return the digest of the code which reads and draws the data """
+def _get_code_version() -> str:
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sha = hashlib.sha1()
+    for d in ['utils', os.path.join('server', 'main')]:
+        for name in sorted(glob.glob(os.path.join(root, d, '**', '*.py'), recursive=True)):
+            try:
+                with open(name, 'rb') as f:
+                    sha.update(f.read())
+            except OSError:
+                continue
+    return sha.hexdigest()[:16]
+
+CODE_VERSION = _get_code_version()
+
+
+""" Let the view answer conditional requests. 'get_version' returns the
+version of the data for the request, the time of its last change in
+nanoseconds since the epoch and whether the period is closed. A version
+of None runs the view without validation. """
+def conditional(
+        get_version,
+        maxage: int = IMAGE_MAX_AGE
+):
+    def decorator(handler):
+        handler.conditional = (get_version, maxage)
+        return handler
+    return decorator
+
+
+""" Return the version and the time of the last change of the log files
+of the logdays. The version also holds the conf entries of the views
+and the digest of the code. A page also depends on the latest log day
+of the menus and the start of the server. The version is None if there
+is a logday without log file. """
+async def get_log_version(
+        conf: dict,
+        logdays: strings,
+        ispage: bool = False
+) -> (Any, int):
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+
+    mtimes = await get_logmtimes(logdays, logprefix, logdir)
+    if len(mtimes) == 0 or None in mtimes:
+        return None, None
+    version, lastmtime = tuple(zip(logdays, mtimes)), max(mtimes)
+    version += (CODE_VERSION, tuple(repr(conf.get(k)) for k in VIEW_CONF_KEYS))
+
+    if ispage:
+        alldays = await get_logdays(logprefix, logdir)
+        newest = await get_logmtimes(alldays[-1:], logprefix, logdir)
+        version += (STARTED, len(alldays), tuple(alldays[-1:]))
+        lastmtime = max([lastmtime, STARTED] + [m for m in newest if m is not None])
+
+    return version, lastmtime
+
+
+def _get_etag(
+        request: web.Request,
+        version: Any
+) -> str:
+    return f'"{hashlib.sha1(repr((request.path_qs, version)).encode()).hexdigest()[:16]}"'
+
+
+""" If-None-Match takes precedence over If-Modified-Since """
+def _is_not_modified(
+        request: web.Request,
+        etag: str,
+        lastmtime: int
+) -> bool:
+    matches = request.headers.get('If-None-Match')
+    if matches is not None:
+        return etag in [m.strip() for m in matches.split(',')]
+
+    since = request.if_modified_since
+    if since is not None:
+        return lastmtime // 1000000000 <= int(since.timestamp())
+
+    return False
+
+
+@web.middleware
+async def conditional_middleware(
+        request: web.Request,
+        handler
+) -> web.StreamResponse:
+    if request.method not in ('GET', 'HEAD'):
+        return await handler(request)
+
+    opted = getattr(request.match_info.handler, 'conditional', None)
+    if opted is None:
+        return await handler(request)
+
+    get_version, maxage = opted
+    version, lastmtime, isclosed = await get_version(request)
+    if version is None:
+        return await handler(request)
+
+    etag = _get_etag(request, version)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': formatdate(lastmtime // 1000000000, usegmt=True),
+        'Cache-Control': f'public, max-age={maxage}' if isclosed else 'no-cache'
+    }
+
+    if _is_not_modified(request, etag, lastmtime):
+        return web.Response(status=304, headers=headers)
+
+    response = await handler(request)
+    if response.status == 200:
+        response.headers.update(headers)
+    return response
+
+
+def setup_conditional(app: web.Application):
+    app.middlewares.append(conditional_middleware)
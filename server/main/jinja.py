@@ -2,7 +2,11 @@ from aiohttp import web
 import aiohttp_jinja2, jinja2
 
 from settings import BASE_DIR
-from utils.csvlog import _get_logdays
+from utils.csvlog import (
+    _get_logdays,
+    _get_logmonths,
+    _get_logyears
+)
 
 conf = None
 def get_logdays_jinja2():
@@ -10,12 +14,10 @@ def get_logdays_jinja2():
     return set(_get_logdays(conf['logprefix'], conf['logdir']))
 
 def get_logmonths_jinja2():
-    logdays = get_logdays_jinja2()
-    return set(ld[:-2] for ld in logdays)
+    return set(_get_logmonths(conf['logprefix'], conf['logdir']))
 
 def get_logyears_jinja2():
-    logdays = get_logdays_jinja2()
-    return set(ld[:2] for ld in logdays)
+    return set(_get_logyears(conf['logprefix'], conf['logdir']))
 
 
 def get_remote_access_jinja2():
@@ -12,6 +12,26 @@ from aiohttp import web
 from settings import setup_conf
 from jinja import setup_jinja2
 from routes import setup_routes
+from warmup import setup_warmup
+from conditional import setup_conditional, CODE_VERSION
+
+from utils.csvlog import (
+    set_cache_size,
+    set_log_workers,
+    set_shared_dir,
+    set_shared_size
+)
+from utils.plots import (
+    set_plot_cache_size,
+    set_plot_cache_dir,
+    set_plot_cache_disk_size,
+    set_plot_cache_days,
+    set_plot_code_version,
+    set_plot_workers
+)
+from utils.limits import (
+    set_limit
+)
 
 from dataclasses import dataclass
 
@@ -19,7 +39,7 @@ from dataclasses import dataclass
 class Config_Args:
     config_path: str
 
-def parse_args() -> Config_Arguments:
+def parse_args() -> Config_Args:
     """Parse command line arguments"""
 
     parser = argparse.ArgumentParser(
@@ -51,8 +71,32 @@ def main() -> int:
 
     app = web.Application()
     setup_conf(app, args.config_path)
+    if 'logcachemb' in app['conf']:
+        set_cache_size(app['conf']['logcachemb'])
+    if 'logworkers' in app['conf']:
+        set_log_workers(app['conf']['logworkers'])
+    if 'logshareddir' in app['conf']:
+        set_shared_dir(app['conf']['logshareddir'])
+    if 'logsharedmb' in app['conf']:
+        set_shared_size(app['conf']['logsharedmb'])
+    if 'plotcachemb' in app['conf']:
+        set_plot_cache_size(app['conf']['plotcachemb'])
+    if 'plotcachedir' in app['conf']:
+        set_plot_cache_dir(app['conf']['plotcachedir'])
+    if 'plotcachediskmb' in app['conf']:
+        set_plot_cache_disk_size(app['conf']['plotcachediskmb'])
+    if 'plotcachedays' in app['conf']:
+        set_plot_cache_days(app['conf']['plotcachedays'])
+    # The views are part of the code of the cached images
+    set_plot_code_version(CODE_VERSION)
+    if 'plotworkers' in app['conf']:
+        set_plot_workers(app['conf']['plotworkers'])
+    for resource, limit in app['conf'].get('limits', dict()).items():
+        set_limit(resource, limit)
     setup_jinja2(app)
     setup_routes(app)
+    setup_conditional(app)
+    setup_warmup(app)
     web.run_app(
         app,
         host=app['conf']['local_host'],
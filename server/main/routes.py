@@ -7,11 +7,21 @@ from views import (
     plot_day,
     plot_month,
     plot_year,
+    plot_compare_month,
+    plot_compare_day,
     plot_predict,
     plot_predict_naive,
     plot_predict_naive_average,
     plot_ai_cast,
     train_ai_cast,
+    img_day,
+    img_month,
+    img_year,
+    img_compare_month,
+    img_compare_day,
+    data_day,
+    data_predict_naive,
+    data_ai_cast,
 )
 
 def setup_routes(app: web.Application):
@@ -22,6 +32,10 @@ def setup_routes(app: web.Application):
     app.router.add_get('/plot_month/{logmonth}', plot_month)
     app.router.add_get('/plot_year', plot_year)
     app.router.add_get('/plot_year/{logyear}', plot_year)
+    app.router.add_get('/plot_compare_month', plot_compare_month)
+    app.router.add_get('/plot_compare_month/{logmonth}', plot_compare_month)
+    app.router.add_get('/plot_compare_day', plot_compare_day)
+    app.router.add_get('/plot_compare_day/{logday}', plot_compare_day)
     app.router.add_get('/plot_predict/{logday}/{what}', plot_predict)
     app.router.add_get('/plot_predict_naive', plot_predict_naive)
     app.router.add_get('/plot_predict_naive/{castday}', plot_predict_naive)
@@ -30,6 +44,18 @@ def setup_routes(app: web.Application):
     app.router.add_get('/plot_ai_cast', plot_ai_cast)
     app.router.add_get('/plot_ai_cast/{castday}', plot_ai_cast)
     app.router.add_get('/train_ai_cast', train_ai_cast)
+    app.router.add_get('/img/day/{logday}/{image:w|kwh|blocks}.png', img_day)
+    app.router.add_get('/img/month/{logmonth}/kwh.png', img_month)
+    app.router.add_get('/img/year/{logyear}/kwh.png', img_year)
+    app.router.add_get('/img/compare_month/{logmonth}/kwh.png', img_compare_month)
+    app.router.add_get('/img/compare_day/{logday}/kwh.png', img_compare_day)
+    app.router.add_get('/data/day', data_day)
+    app.router.add_get('/data/day/{logday}', data_day)
+    app.router.add_get('/data/predict_naive', data_predict_naive)
+    app.router.add_get('/data/predict_naive/{castday}', data_predict_naive)
+    app.router.add_get('/data/predict_naive/{castday}/{cover}', data_predict_naive)
+    app.router.add_get('/data/ai_cast', data_ai_cast)
+    app.router.add_get('/data/ai_cast/{castday}', data_ai_cast)
   
     app.router.add_static(
         '/static/',
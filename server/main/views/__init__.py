@@ -1,9 +1,12 @@
-from .plot_day import plot_day
-from .plot_month import plot_month
-from .plot_year import plot_year
+from .plot_day import plot_day, img_day
+from .plot_month import plot_month, img_month
+from .plot_year import plot_year, img_year
+from .plot_compare import plot_compare_month, plot_compare_day
+from .plot_compare import img_compare_month, img_compare_day
 from .plot_predict import plot_predict
 from .plot_predict_naive import plot_predict_naive
 from .plot_predict_naive_average import plot_predict_naive_average
 from .plot_ai_cast import plot_ai_cast
 from .train_ai_cast import train_ai_cast
+from .data_series import data_day, data_predict_naive, data_ai_cast
 
@@ -0,0 +1,228 @@
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import sys
+
+import asyncio
+from aiohttp import web
+
+import numpy as np
+
+from datetime import(
+    datetime,
+)
+from utils.typing import (
+    strings
+)
+from utils.common import (
+    POWER_NAMES
+)
+from utils.samples import (
+    get_columns_from_csv,
+    get_downsampled,
+    DOWNSAMPLE_METHODS
+)
+from utils.predicts import (
+    predict_naive_today,
+    predict_naive_custom
+)
+from aicast.predict_models import (
+    predict_models
+)
+from pandas import(
+    DatetimeIndex
+)
+
+from conditional import (
+    conditional
+)
+from .plot_day import (
+    _get_day_version
+)
+
+DATA_POINTS = 500
+DATA_MAX_POINTS = 5000
+
+
+""" Return the number of points, the downsample method and the names of
+the columns from the query of the request. The points must be at least
+three and are capped. """
+def _get_query(
+        request: web.Request,
+        names: strings
+) -> (int, str, strings):
+    try:
+        points = int(request.query.get('points', DATA_POINTS))
+    except ValueError:
+        raise web.HTTPBadRequest(text='The points must be a number')
+    if points < 3:
+        raise web.HTTPBadRequest(text='The points must be at least 3')
+    points = min(points, DATA_MAX_POINTS)
+
+    method = request.query.get('method', DOWNSAMPLE_METHODS[0])
+    if method not in DOWNSAMPLE_METHODS:
+        raise web.HTTPBadRequest(
+            text=f'The method must be one of {", ".join(DOWNSAMPLE_METHODS)}')
+
+    query = request.query.get('names')
+    if query is not None:
+        unknown = [n for n in query.split(',') if n not in names]
+        if unknown:
+            raise web.HTTPBadRequest(text=f'Unknown names {", ".join(unknown)}')
+        names = query.split(',')
+
+    return points, method, names
+
+
+""" Return the JSON response with the downsampled columns. Missing
+values are null. The times are in milliseconds since the epoch with
+the samples localized in the configured time zone. """
+async def _get_response(
+        request: web.Request,
+        time: np.ndarray,
+        columns: dict,
+        info: dict
+) -> web.Response:
+    points, method, names = _get_query(request, list(columns))
+
+    series = await get_downsampled(
+        time, {n: columns[n] for n in names}, points, method,
+        request.app['conf']['tz']
+    )
+
+    info.update({'points': points, 'method': method, 'series': {
+        n: {'TIME': t.tolist(),
+            'VALUE': np.where(np.isnan(v), None, np.round(v, 2)).tolist()}
+        for n, (t, v) in series.items()
+    }})
+    return web.json_response(info)
+
+
+""" Return the power samples of the day """
+@conditional(_get_day_version)
+async def data_day(request: web.Request) -> web.Response:
+
+    conf = request.app['conf']
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+    logdayformat = conf['logdayformat']
+
+    try:
+        logday = request.match_info['logday']
+    except KeyError:
+        logday = datetime.strftime(datetime.now(), logdayformat)
+
+    c = await get_columns_from_csv(logday, logprefix, logdir)
+    if c is None:
+        raise web.HTTPNotFound(
+            text=f"Samples logfile '{logday}' not found or not valid")
+
+    return await _get_response(
+        request,
+        c['TIME'],
+        {n: c[n] for n in POWER_NAMES[1:]},
+        {'logday': logday}
+    )
+
+
+""" Return the naive predict of the power samples for the day. The
+phases are the times of the end of the real samples and of the start
+of the cast """
+async def data_predict_naive(request: web.Request) -> web.Response:
+
+    conf = request.app['conf']
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+
+    lat, lon = conf['lat'], conf['lon']
+
+    try:
+        castday = request.match_info['castday']
+    except KeyError:
+        castday = None
+
+    try:
+        cover = request.match_info['cover']
+    except KeyError:
+        cover = None
+
+    cover_24 = (np.array(24*[0]) if cover == 'blue' else \
+                np.array(24*[50]) if cover == 'white' else
+                np.array(24*[100]) if cover == 'grey' else None)
+
+    if castday is None:
+        cast = await predict_naive_today(
+            lat = lat,
+            lon = lon,
+            logprefix = logprefix,
+            logdir = logdir
+        )
+    else:
+        cast = await predict_naive_custom(
+            castday = castday,
+            cover = cover_24,
+            lat = lat,
+            lon = lon,
+            logprefix = logprefix,
+            logdir = logdir
+        )
+
+    _, casthours, realstop, caststart = cast if cast is not None else 4*[None]
+    if casthours is None:
+        raise web.HTTPNotFound(text='No log files found or no irridiance')
+
+    phases = DatetimeIndex([realstop, caststart]).tz_localize(
+        conf['tz'], ambiguous='NaT', nonexistent='shift_forward'
+    ).tz_convert('UTC').tz_localize(None).values.astype('datetime64[ms]')
+
+    return await _get_response(
+        request,
+        np.array(casthours.index),
+        {n: np.array(casthours[n]) for n in POWER_NAMES[1:] if n in casthours},
+        {'castday': castday,
+         'cover': cover,
+         'phases': phases.astype(np.int64).tolist()}
+    )
+
+
+""" Return the AI predict of the power samples for the day """
+async def data_ai_cast(request: web.Request) -> web.Response:
+
+    if sys.version_info < (3, 11):
+        raise web.HTTPNotFound(text='AI cast cannot run on this system.Upgrade!')
+
+    conf = request.app['conf']
+
+    modeldir = conf['modeldir'] if 'modeldir' in conf else None
+    if modeldir is None:
+        raise web.HTTPNotFound(text='Directory for AI models is not configured')
+
+    tz, lat, lon = conf['tz'], conf['lat'], conf['lon']
+    logdayformat = conf['logdayformat']
+
+    today = datetime.strftime(datetime.now(), logdayformat)
+
+    try:
+        castday = request.match_info['castday']
+    except KeyError:
+        castday = today
+
+    castday = today if castday < today else castday
+
+    pool = await predict_models(
+        castday, tz, lat, lon, modeldir
+    )
+    if pool is None:
+        raise web.HTTPNotFound(
+            text=f'Model files for "{castday}" not found or not valid')
+
+    return await _get_response(
+        request,
+        np.array(pool['TIME']),
+        {n: np.array(pool[n]) for n in pool.columns if n != 'TIME'},
+        {'castday': castday}
+    )
@@ -0,0 +1,24 @@
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import base64
+
+from aiohttp import web
+
+
+""" Return the base64 encoded image as PNG. The cache headers are set by
+the conditional middleware """
+def png_response(
+        png: str
+) -> web.Response:
+    if png is None:
+        raise web.HTTPNotFound()
+
+    return web.Response(
+        body=base64.b64decode(png),
+        content_type='image/png'
+    )
@@ -0,0 +1,191 @@
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import sys
+
+import asyncio
+from functools import partial
+from aiohttp import web
+import aiohttp_jinja2
+
+from datetime import(
+    datetime
+)
+from utils.typing import (
+    Any
+)
+from utils.csvlog import (
+    get_logdays,
+    get_logmtimes
+)
+from utils.samples import (
+    get_kwh_sum_compare
+)
+from utils.plots import (
+    get_kwh_line_compare,
+    get_cached_plot
+)
+
+from conditional import (
+    conditional,
+    get_log_version,
+    PAGE_MAX_AGE
+)
+from .images import (
+    png_response
+)
+
+
+""" Return True if the month and the day of the month parse with the
+format of the logdays """
+def _is_compare_valid(
+        logmonth: str,
+        logday: str,
+        logdayformat: str
+) -> bool:
+    try:
+        datetime.strptime(logmonth, logdayformat[:-2])
+        if logday is not None:
+            datetime.strptime(logday, logdayformat)
+    except ValueError:
+        return False
+    return (logday is None) or (logday[:-2] == logmonth)
+
+
+""" Return the overlay of the days of the month of all recorded years.
+The day of the year is marked if requested. Each year is priced with
+its own tariff. Years without a tariff are not priced. The image is
+None if there is no valid log for the month or the input does not
+parse """
+async def _get_compare_image(
+        conf: dict,
+        logmonth: str,
+        logday: str = None
+) -> str:
+
+    price = conf['energy_price']
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+    logdayformat = conf['logdayformat']
+
+    if not _is_compare_valid(logmonth, logday, logdayformat):
+        return None
+
+    async def render() -> str:
+        ckwh = await get_kwh_sum_compare(
+            logmonth, logprefix, logdir, logdayformat)
+        if ckwh is None:
+            return None
+        return await get_kwh_line_compare(
+            ckwh['DAY'], ckwh['YEARS'], ckwh['SMEON'], ckwh['PANEL'],
+            [price.get(y) for y in ckwh['YEARS']], logmonth,
+            None if logday is None else datetime.strptime(logday, logdayformat).day)
+
+    """ The image only changes with the log files of the month in all
+    years """
+    logdays = await get_logdays(logprefix, logdir, f'??{logmonth[2:]}??')
+    mtimes = await get_logmtimes(logdays, logprefix, logdir)
+
+    params = (logmonth, logday, tuple(sorted(price.items())))
+    version = tuple(zip(logdays, mtimes)) if logdays else None
+
+    return await get_cached_plot('img_compare', params, version, render)
+
+
+""" Return the version of the log files of the month in all years """
+async def _get_compare_version(
+        request: web.Request,
+        ispage: bool = False
+) -> (Any, int, bool):
+
+    conf = request.app['conf']
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+    logdayformat = conf['logdayformat']
+
+    thismonth = datetime.strftime(datetime.now(), logdayformat[:-2])
+    logmonth = request.match_info.get(
+        'logmonth', request.match_info.get('logday', thismonth + '01')[:-2])
+
+    logdays = await get_logdays(logprefix, logdir, f'??{logmonth[2:]}??')
+    version, lastmtime = await get_log_version(conf, logdays, ispage)
+    return version, lastmtime, logmonth[2:] != thismonth[2:]
+
+
+""" Return the page with the overlay of the days of the month of all
+recorded years """
+async def _plot_compare(
+        request: web.Request,
+        logmonth: str,
+        logday: str = None
+) -> dict:
+
+    __me__='plot_compare'
+
+    conf = request.app['conf']
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+
+    logger.info(f'{__me__}: started "{logmonth}"')
+
+    if not _is_compare_valid(logmonth, logday, conf['logdayformat']):
+        return aiohttp_jinja2.render_template('error.html', request,
+            {'error' : f"Logday '{logday or logmonth}' is not valid"})
+
+    logdays = await get_logdays(logprefix, logdir, f'??{logmonth[2:]}??')
+    if len(logdays) == 0:
+        return aiohttp_jinja2.render_template('error.html', request,
+            {'error' : f"No valid logfile found for month '{logmonth}'"})
+
+    logger.info(f'{__me__}: done')
+    return aiohttp_jinja2.render_template('plot_compare.html', request,
+        {'logmonth': logmonth,
+         'logday': logday,
+         'years': sorted({ld[:2] for ld in logdays})})
+
+
+@conditional(partial(_get_compare_version, ispage=True), PAGE_MAX_AGE)
+async def plot_compare_month(request: web.Request) -> dict:
+    conf = request.app['conf']
+    logdayformat = conf['logdayformat']
+
+    try:
+        logmonth = request.match_info['logmonth']
+    except KeyError:
+        logmonth = datetime.strftime(datetime.now(), logdayformat[:-2])
+
+    return await _plot_compare(request, logmonth)
+
+
+@conditional(partial(_get_compare_version, ispage=True), PAGE_MAX_AGE)
+async def plot_compare_day(request: web.Request) -> dict:
+    conf = request.app['conf']
+    logdayformat = conf['logdayformat']
+
+    try:
+        logday = request.match_info['logday']
+    except KeyError:
+        logday = datetime.strftime(datetime.now(), logdayformat)
+
+    return await _plot_compare(request, logday[:-2], logday)
+
+
+@conditional(_get_compare_version)
+async def img_compare_month(request: web.Request) -> web.Response:
+    conf = request.app['conf']
+
+    png = await _get_compare_image(conf, request.match_info['logmonth'])
+    return png_response(png)
+
+
+@conditional(_get_compare_version)
+async def img_compare_day(request: web.Request) -> web.Response:
+    conf = request.app['conf']
+
+    logday = request.match_info['logday']
+    png = await _get_compare_image(conf, logday[:-2], logday)
+    return png_response(png)
@@ -8,6 +8,7 @@ logger = logging.getLogger(__name__)
 import sys
 
 import asyncio
+from functools import partial
 from aiohttp import web
 import aiohttp_jinja2
 
@@ -18,12 +19,18 @@ from datetime import(
     datetime,
     timedelta
 )
+from utils.typing import (
+    Any
+)
 from utils.common import (
     ymd_yesterday,
     ymd_tomorrow,
     ymd_365_days_ago,
     ymd_365_days_ahead,
 )
+from utils.csvlog import (
+    get_logmtimes
+)
 from utils.samples import (
     get_columns_from_csv, 
 )
@@ -31,38 +38,54 @@ from utils.plots import (
     get_blocks,
     get_w_line,
     get_kwh_line,
+    get_cached_plot
 )
 
-@aiohttp_jinja2.template('plot_day.html')
-async def plot_day(request: web.Request) -> dict:
+from conditional import (
+    conditional,
+    get_log_version,
+    PAGE_MAX_AGE
+)
+from .images import (
+    png_response
+)
 
-    conf = request.app['conf']
+DAY_IMAGES = ['w', 'kwh']
 
-    price = conf['energy_price']
-    full_wh = conf['battery_full_wh']
-    full_kwh = full_wh / 1000
-    empty_kwh = conf['battery_min_percent'] /100 * full_kwh
-    
-    logdir = conf['logdir']
-    logprefix = conf['logprefix']
-    logdayformat = conf['logdayformat']
+""" The blocks of the last sample of the day """
+async def _get_blocks(c: dict) -> str:
+    time, spph = c['TIME'], c['SPPH']
+    smp, ivp1, ivp2 = c['SMP'], c['IVP1'], c['IVP2']
+    sbpi, sbpo, sbpb = c['SBPI'], c['SBPO'], c['SBPB']
+    spp1, spp2, spp3, spp4 = c['SPP1'], c['SPP2'], c['SPP3'], c['SPP4']
 
-    today = datetime.strftime(datetime.now(), logdayformat)
-    
-    try:
-        logday = request.match_info['logday']
-    except KeyError:
-        logday = today 
+    # Considers solix out internally!
+    return await get_blocks(
+        time[-1] if time is not None else None,
+        smp[-1] if smp is not None else 0,
+        ivp1[-1] if ivp1 is not None else 0,
+        ivp2[-1] if ivp1 is not None else 0,
+        spph[-1] if spph is not None else 0,
+        sbpi[-1] if sbpi is not None else 0,
+        sbpo[-1] if sbpo is not None else 0,
+        sbpb[-1] if sbpb is not None else 0,
+        spp1[-1] if spp1 is not None else 0,
+        spp2[-1] if spp2 is not None else 0,
+        spp3[-1] if spp3 is not None else 0,
+        spp4[-1] if spp4 is not None else 0
+    )
 
-    c = await get_columns_from_csv(logday, logprefix, logdir)
-    if c is None:
-        return aiohttp_jinja2.render_template('error.html', request,
-            {'error' : f"Samples logfile '{logday}' not found or not valid"})
 
+""" The power and the energy plots of the day """
+async def _get_lines(
+        c: dict,
+        price: float,
+        full_kwh: float,
+        empty_kwh: float
+) -> tuple:
     time, spph = c['TIME'], c['SPPH']
     smp, ivp1, ivp2 = c['SMP'], c['IVP1'], c['IVP2']
     sbpi, sbpo, sbpb, sbsb = c['SBPI'], c['SBPO'], c['SBPB'], c['SBSB'] 
-    spp1, spp2, spp3, spp4 = c['SPP1'], c['SPP2'], c['SPP3'], c['SPP4']
 
     if smp is not None:    
         smpon = np.zeros_like(smp)
@@ -76,22 +99,6 @@ async def plot_day(request: web.Request) -> dict:
         sbpbcharge[sbpb<0] = -sbpb[sbpb<0]
         sbpbdischarge[sbpb>0] = sbpb[sbpb>0]
 
-    # Considers solix out internally!
-    blocks = await get_blocks(
-        time[-1] if time is not None else None,
-        smp[-1] if smp is not None else 0,
-        ivp1[-1] if ivp1 is not None else 0,
-        ivp2[-1] if ivp1 is not None else 0,
-        spph[-1] if spph is not None else 0,
-        sbpi[-1] if sbpi is not None else 0,
-        sbpo[-1] if sbpo is not None else 0,
-        sbpb[-1] if sbpb is not None else 0,
-        spp1[-1] if spp1 is not None else 0,
-        spp2[-1] if spp2 is not None else 0,
-        spp3[-1] if spp3 is not None else 0,
-        spp4[-1] if spp4 is not None else 0
-    )
-    
     # Override sbpi  with inverter if solix is out, eg low protection
     # ivp = ((ivp1 if ivp1 is not None else 0) +
     #        (ivp2 if ivp2 is not None else 0))
@@ -114,12 +121,108 @@ async def plot_day(request: web.Request) -> dict:
             sbpbcharge.cumsum()/1000/60 if sbpb is not None else None,
             sbpbdischarge.cumsum()/1000/60 if sbpb is not None else None,
             sbsb*full_kwh if sbsb is not None else None,
-            empty_kwh, full_kwh, price[logday[:2]]))
+            empty_kwh, full_kwh, price))
+
+    return w, kwh
+
+
+""" Return the image of the day. The image is None if there is no valid
+log for the day """
+async def _get_day_image(
+        conf: dict,
+        logday: str,
+        image: str
+) -> str:
+
+    price = conf['energy_price']
+    full_wh = conf['battery_full_wh']
+    full_kwh = full_wh / 1000
+    empty_kwh = conf['battery_min_percent'] /100 * full_kwh
+    
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+
+    """ The images only change with the log file of the day """
+
+    async def render_lines() -> tuple:
+        c = await get_columns_from_csv(logday, logprefix, logdir)
+        if c is None:
+            return None
+        return await _get_lines(c, price[logday[:2]], full_kwh, empty_kwh)
+
+    async def render_blocks() -> str:
+        c = await get_columns_from_csv(logday, logprefix, logdir)
+        if c is None:
+            return None
+        return await _get_blocks(c)
+
+    mtime, = await get_logmtimes([logday], logprefix, logdir)
+    if mtime is None:
+        return None
+
+    if image == 'blocks':
+        view, params, render = 'plot_day_blocks', (logday,), render_blocks
+    else:
+        view, params, render = 'plot_day', (
+            logday, price[logday[:2]], full_kwh, empty_kwh
+        ), render_lines
+
+    images = await get_cached_plot(view, params, mtime, render)
+    if images is None:
+        return None
+    return images if image == 'blocks' else images[DAY_IMAGES.index(image)]
+
+
+""" Return the version of the log file of the day """
+async def _get_day_version(
+        request: web.Request,
+        ispage: bool = False
+) -> (Any, int, bool):
+
+    conf = request.app['conf']
+    logdayformat = conf['logdayformat']
+
+    today = datetime.strftime(datetime.now(), logdayformat)
+    logday = request.match_info.get('logday', today)
+
+    version, lastmtime = await get_log_version(conf, [logday], ispage)
+    return version, lastmtime, logday < today
+
+
+@conditional(partial(_get_day_version, ispage=True), PAGE_MAX_AGE)
+@aiohttp_jinja2.template('plot_day.html')
+async def plot_day(request: web.Request) -> dict:
+
+    conf = request.app['conf']
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+    logdayformat = conf['logdayformat']
+
+    today = datetime.strftime(datetime.now(), logdayformat)
+    
+    try:
+        logday = request.match_info['logday']
+    except KeyError:
+        logday = today 
+
+    mtime, = await get_logmtimes([logday], logprefix, logdir)
+    if mtime is None:
+        return aiohttp_jinja2.render_template('error.html', request,
+            {'error' : f"Samples logfile '{logday}' not found or not valid"})
 
     return {'logday': logday,
             'logyesterday': ymd_yesterday(logday),
             'logtomorrow': ymd_tomorrow(logday),
             'log365daysago': ymd_365_days_ago(logday),
             'log365daysahead': ymd_365_days_ahead(logday),
-            'blocks': blocks if logday == today else None,
-            'w': w, 'kwh': kwh}
+            'istoday': logday == today}
+
+
+@conditional(_get_day_version)
+async def img_day(request: web.Request) -> web.Response:
+
+    conf = request.app['conf']
+
+    png = await _get_day_image(
+        conf, request.match_info['logday'], request.match_info['image'])
+    return png_response(png)
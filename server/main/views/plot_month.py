@@ -8,6 +8,7 @@ logger = logging.getLogger(__name__)
 import sys
 
 import asyncio
+from functools import partial
 from aiohttp import web
 import aiohttp_jinja2
 
@@ -15,26 +16,92 @@ from datetime import(
     datetime,
     timedelta
 )
+from utils.typing import (
+    Any
+)
 from utils.common import (
     ym_1_month_ago,
     ym_1_month_ahead,
     ym_12_month_ago,
     ym_12_month_ahead
 )
+from utils.csvlog import (
+    get_logdays,
+    get_logmtimes
+)
 from utils.samples import (
     get_kwh_sum_month_unified
 )
 from utils.plots import (
-    get_kwh_bar_unified
+    get_kwh_bar_unified,
+    get_cached_plot
+)
+
+from conditional import (
+    conditional,
+    get_log_version,
+    PAGE_MAX_AGE
 )
+from .images import (
+    png_response
+)
+
+""" Return the image of the month. The image is None if there is no
+valid log for the month """
+async def _get_month_image(
+        conf: dict,
+        logmonth: str
+) -> str:
+
+    price = conf['energy_price']
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+    logdayformat = conf['logdayformat']
+
+    async def render() -> str:
+        umkwh = await get_kwh_sum_month_unified(
+            logmonth, logprefix, logdir, logdayformat)
+        if umkwh is None:
+            return None
+        return await get_kwh_bar_unified(
+            *umkwh.values(), price[logmonth[:2]], 0.7, '%d%n%a')
+
+    """ The image only changes with the log files of the month """
+    logdays = await get_logdays(logprefix, logdir, f'{logmonth}*')
+    mtimes = await get_logmtimes(logdays, logprefix, logdir)
+
+    params = (logmonth, price[logmonth[:2]])
+    version = tuple(zip(logdays, mtimes)) if logdays else None
+
+    return await get_cached_plot('plot_month', params, version, render)
+
 
+""" Return the version of the log files of the month """
+async def _get_month_version(
+        request: web.Request,
+        ispage: bool = False
+) -> (Any, int, bool):
+
+    conf = request.app['conf']
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+    logdayformat = conf['logdayformat']
+
+    thismonth = datetime.strftime(datetime.now(), logdayformat[:-2])
+    logmonth = request.match_info.get('logmonth', thismonth)
+
+    logdays = await get_logdays(logprefix, logdir, f'{logmonth}*')
+    version, lastmtime = await get_log_version(conf, logdays, ispage)
+    return version, lastmtime, logmonth < thismonth
+
+
+@conditional(partial(_get_month_version, ispage=True), PAGE_MAX_AGE)
 @aiohttp_jinja2.template('plot_month.html')
 async def plot_month(request: web.Request) -> dict:
 
     __me__='plot_month'
 
     conf = request.app['conf']
-    price = conf['energy_price']
     logdir = conf['logdir']
     logprefix = conf['logprefix']
     logdayformat = conf['logdayformat']
@@ -46,19 +113,22 @@ async def plot_month(request: web.Request) -> dict:
 
     logger.info(f'{__me__}: started "{logmonth}"')
 
-    umkwh = await get_kwh_sum_month_unified(
-        logmonth, logprefix, logdir, logdayformat)
-    if umkwh is None:
+    if len(await get_logdays(logprefix, logdir, f'{logmonth}*')) == 0:
         return aiohttp_jinja2.render_template('error.html', request,
             {'error' : f"No valid logfile found for month '{logmonth}'"})
 
-    umplot  = await get_kwh_bar_unified(
-        *umkwh.values(), price[logmonth[:2]], 0.7, '%d%n%a')
-
     logger.info(f'{__me__}: done')
     return {'logmonth': logmonth,
             'log1monthago': ym_1_month_ago(logmonth),
             'log1monthahead': ym_1_month_ahead(logmonth),
             'log12monthago': ym_12_month_ago(logmonth),
-            'log12monthahead': ym_12_month_ahead(logmonth),
-            'kwh': umplot}
+            'log12monthahead': ym_12_month_ahead(logmonth)}
+
+
+@conditional(_get_month_version)
+async def img_month(request: web.Request) -> web.Response:
+
+    conf = request.app['conf']
+
+    png = await _get_month_image(conf, request.match_info['logmonth'])
+    return png_response(png)
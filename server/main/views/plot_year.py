@@ -8,25 +8,93 @@ logger = logging.getLogger(__name__)
 import sys
 
 import asyncio
+from functools import partial
 from aiohttp import web
 import aiohttp_jinja2
 
+from datetime import(
+    datetime
+)
+from utils.typing import (
+    Any
+)
+from utils.csvlog import (
+    get_logdays,
+    get_logmtimes
+)
 from utils.samples import (
     get_kwh_sum_year_unified
 )
 from utils.plots import (
-    get_kwh_bar_unified
+    get_kwh_bar_unified,
+    get_cached_plot
+)
+
+from conditional import (
+    conditional,
+    get_log_version,
+    PAGE_MAX_AGE
 )
+from .images import (
+    png_response
+)
+
+""" Return the image of the year. The image is None if there is no
+valid log for the year """
+async def _get_year_image(
+        conf: dict,
+        logyear: str
+) -> str:
+
+    price = conf['energy_price']
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+    logdayformat = conf['logdayformat']
+
+    async def render() -> str:
+        uykwh = await get_kwh_sum_year_unified(
+            logyear, logprefix, logdir, logdayformat)        
+        if uykwh is None:
+            return None
+        return await get_kwh_bar_unified(
+            *uykwh.values(), price[logyear], 14.0, '%b')
+
+    """ The image only changes with the log files of the year """
+    logdays = await get_logdays(logprefix, logdir, f'{logyear}*')
+    mtimes = await get_logmtimes(logdays, logprefix, logdir)
+
+    params = (logyear, price[logyear])
+    version = tuple(zip(logdays, mtimes)) if logdays else None
+
+    return await get_cached_plot('plot_year', params, version, render)
+
+
+""" Return the version of the log files of the year """
+async def _get_year_version(
+        request: web.Request,
+        ispage: bool = False
+) -> (Any, int, bool):
 
+    conf = request.app['conf']
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+    logdayformat = conf['logdayformat']
+
+    thisyear = datetime.strftime(datetime.now(), logdayformat[:2])
+    logyear = request.match_info.get('logyear', thisyear)
+
+    logdays = await get_logdays(logprefix, logdir, f'{logyear}*')
+    version, lastmtime = await get_log_version(conf, logdays, ispage)
+    return version, lastmtime, logyear < thisyear
+
+
+@conditional(partial(_get_year_version, ispage=True), PAGE_MAX_AGE)
 @aiohttp_jinja2.template('plot_year.html')
 async def plot_year(request: web.Request) -> dict:
     __me__='plot_year'
 
     conf = request.app['conf']
-    logdir = conf['logdir']
-    logprefix = conf['logprefix']
     logdayformat = conf['logdayformat']
-    price = conf['energy_price']
     
     try:
         logyear = request.match_info['logyear']
@@ -34,11 +102,14 @@ async def plot_year(request: web.Request) -> dict:
         logyear = datetime.strftime(datetime.now(), logdayformat[:2])
 
     logger.info(f'{__me__}: started "{logyear}"')
-    
-    uykwh = await get_kwh_sum_year_unified(
-        logyear, logprefix, logdir, logdayformat)        
-    uyplot  = await get_kwh_bar_unified(
-        *uykwh.values(), price[logyear], 14.0, '%b')
-
     logger.info(f'{__me__}: done')
-    return {'logyear': logyear, 'kwh': uyplot}
+    return {'logyear': logyear}
+
+
+@conditional(_get_year_version)
+async def img_year(request: web.Request) -> web.Response:
+
+    conf = request.app['conf']
+
+    png = await _get_year_image(conf, request.match_info['logyear'])
+    return png_response(png)
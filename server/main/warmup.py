@@ -0,0 +1,74 @@
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+__doc__=""" Warms up the caches after a start of the server in the
+background. The cached log days of the last run are restored from the
+snapshot. The last days and the current month are preloaded.
+"""
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import asyncio
+
+from datetime import datetime
+
+from aiohttp import web
+
+from utils.csvlog import (
+    get_logs,
+    save_cache_snapshot,
+    load_cache_snapshot
+)
+from utils.samples import (
+    get_kwh_sum_month_unified
+)
+
+
+async def warmup(conf: dict) -> None:
+    logdir = conf['logdir']
+    logprefix = conf['logprefix']
+    logdayformat = conf['logdayformat']
+
+    snapname = conf.get('logcachesnapshot')
+    if snapname is not None:
+        restored = await load_cache_snapshot(snapname)
+        logger.info(f'Restored "{restored}" log days')
+
+    logwarmdays = conf.get('logwarmdays', 0)
+    if logwarmdays > 0:
+        await get_logs(logwarmdays, '*', logprefix, logdir)
+        logger.info(f'Preloaded the last "{logwarmdays}" log days')
+
+        logmonth = datetime.strftime(datetime.now(), logdayformat[:-2])
+        await get_kwh_sum_month_unified(
+            logmonth, logprefix, logdir, logdayformat
+        )
+        logger.info(f'Preloaded the month "{logmonth}"')
+
+
+""" Runs the warmup while the server is up. The server does not wait
+for it. The snapshot is saved on shutdown. """
+async def warmup_ctx(app: web.Application):
+    task = asyncio.create_task(warmup(app['conf']))
+
+    yield
+
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.error(f'Warmup failed: {e}')
+
+    snapname = app['conf'].get('logcachesnapshot')
+    if snapname is not None:
+        save_cache_snapshot(snapname)
+
+
+def setup_warmup(app: web.Application):
+    app.cleanup_ctx.append(warmup_ctx)
@@ -19,6 +19,7 @@ setup(name='solar_checker',
           './scripts/tuya_plug_switch_set.py',
           './scripts/solar_checker_ai_predict.py',
           './scripts/solar_checker_ai_train.py',
+          './scripts/solar_checker_compact.py',
           './scripts/solar_checker_naive_predict.py',
           './scripts/solar_checker_naive_check.py',
           './scripts/solar_checker_predict_minute.py',
@@ -44,6 +45,7 @@ setup(name='solar_checker',
           './scripts/solar_checker_slots.py',
           './scripts/solar_checker_slots_anyday.sh',
           './scripts/solar_checker_slots_yesterday.sh',
+          './scripts/solar_checker_slots_range.sh',
           './scripts/solar_checker_zeroise.py',
           './scripts/solar_checker_zeroise.sh',
           './server/main/p12.0.run',
@@ -10,7 +10,7 @@ from datetime import (
 
 import pandas as pd
 
-from .typing import t64
+from .typing import t64, t64s, List
 
 """ The samples in the record logs """
 SAMPLE_NAMES = [
@@ -170,6 +170,45 @@ def t64_h_next(t: t64) -> t64:
     return t64(dt + timedelta(hours=1))
 
 
+
+""" Vectorized versions of the converters above. They parse a whole
+column in one go instead of a Python round trip per sample """
+
+def _t64s_index(t: t64s) -> pd.DatetimeIndex:
+    if pd.api.types.is_datetime64_any_dtype(t):
+        return pd.DatetimeIndex(t)
+    return pd.DatetimeIndex(pd.to_datetime(t, format='ISO8601'))
+
+def ymd_over_t64s(t: t64s, day: str) -> t64s:
+    dti = _t64s_index(t).floor('s')
+    dt_day = pd.Timestamp(datetime.strptime(day, "%y%m%d"))
+    return (dt_day + (dti - dti.normalize())).values
+
+def t64s_to_hm(t: t64s) -> List[str]:
+    return list(_t64s_index(t).strftime("%H:%M"))
+
+def t64s_clear(t: t64s) -> t64s:
+    dti = _t64s_index(t)
+    return (pd.Timestamp(1954, 12, 10) + (dti - dti.normalize())).values
+
+def t64s_first(t: t64s) -> t64s:
+    return _t64s_index(t).floor('min').values
+
+def t64s_last(t: t64s) -> t64s:
+    return (_t64s_index(t).floor('min') +
+            pd.Timedelta(seconds=59, microseconds=999999)).values
+
+def t64s_h_first(t: t64s) -> t64s:
+    return _t64s_index(t).floor('h').values
+
+def t64s_h_last(t: t64s) -> t64s:
+    return (_t64s_index(t).floor('h') +
+            pd.Timedelta(minutes=59, seconds=59, microseconds=999999)).values
+
+def t64s_h_next(t: t64s) -> t64s:
+    return (_t64s_index(t) + pd.Timedelta(hours=1)).values
+
+
 def t64_from_iso(value: str) -> t64:
     try:
         dt = datetime.fromisoformat(value)
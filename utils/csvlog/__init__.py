@@ -1,13 +1,34 @@
 from .csvlog import (
     _get_logdays, # jinja2
+    _get_logmonths, # jinja2
+    _get_logyears, # jinja2
     get_logdays,
+    get_logmtimes,
     get_log,
     get_sample_log,
     get_power_log,
     get_predict_power_log,
     get_logs,
     get_logs_df,
+    get_archive_logs,
+    iter_logs,
     get_tunnel_logdays,
     get_tunnel_logs,
-    get_tunnel_logs_df
+    get_tunnel_logs_df,
+    iter_tunnel_logs,
+    set_cache_size,
+    get_cache_stats,
+    save_cache_snapshot,
+    load_cache_snapshot,
+    set_log_workers,
+    set_shared_dir,
+    set_shared_size
+)
+from .logcompact import (
+    compact_logs
+)
+from .logclean import (
+    QUALITY_FILLED,
+    QUALITY_FROZEN,
+    QUALITY_LAZY
 )
@@ -12,64 +12,232 @@ logger = logging.getLogger(__name__)
 
 import sys
 import os.path
-import glob
+import json
 import asyncio
+import zipfile
+import tempfile
+import threading
+
+import numpy as np
+
+from io import BytesIO
+from itertools import islice
+from collections import deque
 
 from ..typing import(
-    f64, t64, Dict, List, strings
+    f64, t64, Dict, List, AsyncIterator, strings
 )
 from ..common import(
     POWER_NAMES,
     PREDICT_POWER_NAMES,
     SAMPLE_NAMES,
-    t64_first,
-    ymd_today,
-    ymd_yesterday
+    t64s_first,
+    ymd_today
 )
 from pandas import(
     DataFrame,
+    Series,
     read_csv,
     concat
 )
+from ..limits import(
+    gather_bounded
+)
+from .logindex import(
+    _get_logindex,
+    ZIPEXT
+)
+from .logcache import(
+    LogCache
+)
+from .logschema import(
+    _read_schema
+)
+from .logshared import(
+    set_shared_dir,
+    set_shared_size,
+    _read_shared,
+    _write_shared
+)
+from .logstore import(
+    _get_store_name,
+    _is_store_valid,
+    _read_store,
+    _write_store
+)
+from .logclean import(
+    _clean_samples
+)
+from .logarchive import(
+    _get_logarchive,
+    _to_grid,
+    _from_grid
+)
+from .logpool import(
+    set_log_workers,
+    has_log_workers,
+    _get_pool_log
+)
+
+
+CACHE = LogCache()
 
+""" Set the memory budget of the cache for the log days """
+def set_cache_size(maxmb: float) -> None:
+    CACHE.resize(maxmb)
 
-CACHE = dict()
+""" Return the hit, miss and eviction counters of the cache """
+def get_cache_stats() -> Dict:
+    return CACHE.stats()
+
+""" Save the keys of the cached log days. The samples are not saved,
+they are in the binary stores of the closed days already """
+def save_cache_snapshot(
+        snapname: str
+) -> bool:
+    keys = [[logdir, logprefix, None if colkey is None else list(colkey), isclean, logday]
+            for logdir, logprefix, colkey, isclean, logday in CACHE.keys()]
+
+    tempname = None
+    logger.info(f'Saving "{len(keys)}" cache keys to "{snapname}"')
+    try:
+        fd, tempname = tempfile.mkstemp(
+            suffix='.tmp', dir=os.path.dirname(snapname) or '.'
+        )
+        with os.fdopen(fd, 'w') as f:
+            json.dump(keys, f)
+        os.replace(tempname, snapname)
+    except OSError:
+        logger.warning(f'Cannot save cache snapshot "{snapname}"')
+        if tempname is not None and os.path.isfile(tempname):
+            os.remove(tempname)
+        return False
+
+    return True
+
+""" Fill the cache with the log days of the snapshot in their order of
+use. Returns the number of restored log days """
+async def load_cache_snapshot(
+        snapname: str
+) -> int:
+    try:
+        with open(snapname, 'r') as f:
+            keys = json.load(f)
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError):
+        logger.error(f'Erroneous cache snapshot "{snapname}"')
+        return 0
+
+    logger.info(f'Restoring "{len(keys)}" cache keys from "{snapname}"')
+    restored = 0
+    for key in keys:
+        if len(key) != 5:
+            # Snapshot of an older version
+            continue
+        logdir, logprefix, usecols, isclean, logday = key
+        log = await get_log(logday, logprefix, logdir, usecols, isclean)
+        restored += 0 if log is None else 1
+    return restored
+
+""" Return the path of the log file for a logday """
+def _get_logname(
+        logday: str,
+        logprefix: str,
+        logdir: str
+) -> str:
+    return os.path.join(logdir, f'{logprefix}_{logday}.log')
+
+""" Return the path of the file with the samples of a logday. Closed
+days may be compressed or merged into the archive of their month. None
+if there is no such file. """
+def _get_logsource(
+        logday: str,
+        logprefix: str,
+        logdir: str
+) -> str:
+    logname = _get_logname(logday, logprefix, logdir)
+    if os.path.isfile(logname):
+        return logname
+    return _get_logindex(logprefix, logdir).get_logsource(logday)
+
+""" Return the modification time of the log file for a logday. A day
+merged into the archive of its month keeps the time of its log file.
+None if there is no log file. """
+def _get_logmtime(
+        logday: str,
+        logprefix: str,
+        logdir: str
+) -> int:
+    logname = _get_logname(logday, logprefix, logdir)
+    try:
+        return os.stat(logname).st_mtime_ns
+    except OSError:
+        pass
+    return _get_logindex(logprefix, logdir).get_logmtime(logday)
+
+""" Return the modification times of the log files of the logdays.
+The item is None for a logday without log file """
+async def get_logmtimes(
+        logdays: strings,
+        logprefix: str,
+        logdir: str
+) -> List[int]:
+    if sys.version_info >= (3, 9):
+        return await asyncio.to_thread(
+            lambda: [_get_logmtime(ld, logprefix, logdir) for ld in logdays]
+        )
+    return [_get_logmtime(ld, logprefix, logdir) for ld in logdays]
+
+""" Return the key of the projected columns. None selects all """
+def _get_colkey(
+        usecols: strings
+) -> tuple:
+    return None if usecols is None else tuple(sorted(set(usecols)))
 
 def cache(f):
 
     async def wrapper(
             logday: str,
             logprefix: str,
-            logdir: str
+            logdir: str,
+            usecols: strings = None,
+            isclean: bool = False
     ) -> DataFrame:
 
         if ((logday is None) or
+            (logprefix is None) or
+            (logdir is None) or
             (logday == ymd_today())
         ):
             logger.info(f'New values without store for "{logday}"')
             data = await f(
                 logday,
                 logprefix,
-                logdir
+                logdir,
+                usecols,
+                isclean
             )
             return data
-        
-        if ((logday in CACHE) and
-            ((logday != ymd_yesterday(ymd_today())) or
-             (CACHE[logday] is not None))
-        ):
+
+        key = (logdir, logprefix, _get_colkey(usecols), isclean, logday)
+        mtime = _get_logmtime(logday, logprefix, logdir)
+
+        ishit, data = CACHE.get(key, mtime)
+        if ishit:
             logger.info(f'Using values of "{logday}" from cache')
-            data = CACHE[logday]
             await asyncio.sleep(0)
             return data
         
         data = await f(
             logday,
             logprefix,
-            logdir
+            logdir,
+            usecols,
+            isclean
         )
         logger.info(f'Store and use values of "{logday}" in cache')
-        CACHE[logday] = data
+        CACHE.put(key, mtime, data)
         return data
 
     return wrapper
@@ -80,13 +248,19 @@ def _get_logdays(
         logdir: str,
         logdayformat: str = '*'
 ) -> strings:
-    pattern = os.path.join(logdir, f'{logprefix}_{logdayformat}.log')
-    logpaths = glob.glob(pattern)
-    logfiles = [os.path.basename(lp) for lp in logpaths]
-    lognames = [os.path.splitext(lf)[0] for lf in logfiles]
-    logdays = [ln.replace(f'{logprefix}_', '') for ln in lognames]
-    logdays.sort()
-    return logdays
+    return _get_logindex(logprefix, logdir).get_logdays(logdayformat)
+
+def _get_logmonths(
+        logprefix: str,
+        logdir: str
+) -> strings:
+    return _get_logindex(logprefix, logdir).get_logmonths()
+
+def _get_logyears(
+        logprefix: str,
+        logdir: str
+) -> strings:
+    return _get_logindex(logprefix, logdir).get_logyears()
 
 async def get_logdays(
         logprefix: str,
@@ -98,6 +272,13 @@ async def get_logdays(
     else:
         return _get_logdays(**vars())
 
+def _get_tunnel_logdays(
+        logwindow:int,
+        logprefix: str,
+        logdir: str
+) -> strings:
+    return _get_logindex(logprefix, logdir).get_tunnel_logdays(logwindow)
+
 """ Return the logdays from the windows in each year relative from
 'today'.  'today' is the last item in the retuned list """
 async def get_tunnel_logdays(
@@ -105,74 +286,268 @@ async def get_tunnel_logdays(
         logprefix: str,
         logdir: str
 ) -> strings:
-    # Get the list of of reversed logdays
-    rlds = (await get_logdays(
-        logprefix = logprefix,
-        logdir = logdir,
-    )) [::-1]
-    # Extract the list of periodic windows
-    wlds = [rlds[max(0,d-logwindow):min(len(rlds),d+logwindow+1)]
-            for d,rld in enumerate(rlds) if rld[2:] == rlds[0][2:]]
-    return [d for l in wlds for d in l][::-1]    
+    if sys.version_info >= (3, 9): 
+        return await asyncio.to_thread(_get_tunnel_logdays, **vars())
+    else:
+        return _get_tunnel_logdays(**vars())
+
+
+""" Name and type the raw samples of a CSV log. Samples parsed with
+a schema are already named and typed. """
+def _fix_samples(
+        samples: DataFrame,
+        istyped: bool = False
+) -> DataFrame:
+
+    if not istyped:
+        # With time new samples were added to the
+        # right. Name the remaining column names!
+        samples.columns = SAMPLE_NAMES[:len(samples.columns)]
+
+    # Cleanup. Parse the whole column at once and sync to the minute
+    time = Series(
+        t64s_first(samples['TIME']), index=samples.index, name='TIME'
+    )
+    # All colums but TIME are float
+    columns = samples.iloc[:,1:]
+    if not istyped:
+        columns = columns.astype(f64)
+
+    # TIME must not be index!
+    
+    return concat(
+        [time,columns], axis=1
+    ).drop_duplicates(
+        'TIME', keep='first'
+    ).reset_index(drop=True)
+
+
+""" Select the requested columns. TIME is needed to remove duplicates
+and is only dropped here if not requested. """
+def _project_samples(
+        samples: DataFrame,
+        usecols: strings
+) -> DataFrame:
+    if (samples is None) or (usecols is None):
+        return samples
+    columns = [c for c in samples.columns if c in usecols]
+    if len(columns) == len(samples.columns):
+        return samples
+    return samples[columns]
+
+
+""" The state of the incremental readers of the growing log files. For
+each log directory and prefix the name, inode and read offset of the
+current log file are kept together with the samples parsed so far """
+TAILS = dict()
+TAILS_LOCK = threading.Lock()
+
+""" Read the samples of a growing log file. Only the lines appended
+since the previous call are parsed. Incomplete last lines are left for
+the next call. """
+def _read_tail(
+        logname: str,
+        logkey: tuple
+) -> DataFrame:
+
+    with TAILS_LOCK:
+        try:
+            stat = os.stat(logname)
+        except OSError:
+            logger.warning(f'CSV data file not found "{logname}"')
+            return None
+
+        tailname, inode, offset, samples = TAILS.get(
+            logkey, (None, None, 0, None)
+        )
+        if ((tailname != logname) or
+            (inode != stat.st_ino) or
+            (stat.st_size < offset)):
+            # New day, replaced or truncated file. Start over!
+            offset, samples = 0, None
+
+        if stat.st_size == offset:
+            logger.info(f'No new CSV data in file "{logname}"')
+            return samples
+
+        try:
+            with open(logname, 'rb') as f:
+                f.seek(offset)
+                chunk = f.read(stat.st_size - offset)
+        except OSError:
+            logger.error(f'Erroneous CSV data file "{logname}"')
+            return None
+
+        # Only parse complete lines
+        chunk = chunk[:chunk.rfind(b'\n')+1]
+        if len(chunk) == 0:
+            return samples
+
+        logger.info(f'Reading {len(chunk)} new CSV bytes from file "{logname}"')
+        try:
+            newsamples = _parse_samples(BytesIO(chunk), logname)
+        except:
+            logger.error(f'Erroneous CSV data file "{logname}"')
+            return None
+
+        if samples is not None:
+            newsamples = newsamples[
+                ~newsamples['TIME'].isin(samples['TIME'])
+            ]
+            samples = concat(
+                [samples, newsamples], ignore_index=True
+            )
+        else:
+            samples = newsamples
+
+        TAILS[logkey] = (logname, stat.st_ino, offset + len(chunk), samples)
+        return samples
+
+
+""" Parse the CSV samples with the names and types of the schema of
+the log file. Without schema the names are derived from the number of
+columns. """
+def _parse_samples(
+        source,
+        logname: str
+) -> DataFrame:
+    schema = _read_schema(logname)
+    if schema is None:
+        return _fix_samples(read_csv(source, header=None))
+
+    names, dtypes = schema
+    return _fix_samples(
+        read_csv(source, header=None, names=names, dtype=dtypes),
+        istyped=True
+    )
+
+
+""" Parse the CSV samples of a closed day. Compressed files are
+decompressed on the fly. A month archive holds the day under the name
+of its log file. """
+def _read_logsource(
+        logsource: str,
+        logname: str
+) -> DataFrame:
+    if logsource.endswith(ZIPEXT):
+        with zipfile.ZipFile(logsource) as z:
+            with z.open(os.path.basename(logname)) as f:
+                return _parse_samples(f, logname)
+    return _parse_samples(logsource, logname)
 
 
+""" Return the samples of a logday. Cleaned samples are on the minutes
+of the day with the QUALITY column. Closed days are cleaned only once. """
 def _get_log(
         logday: str,
         logprefix: str,
-        logdir: str
+        logdir: str,
+        usecols: strings = None,
+        isclean: bool = False
 ) -> DataFrame:
 
     if (logday is None) or (logprefix is None) or (logdir is None):
         logger.info(f'Reading CSV data from "stdin"')
         try:
-            samples = read_csv(sys.stdin, header=None)
+            samples = _fix_samples(read_csv(sys.stdin, header=None))
         except:
             logger.error(f'Erroneous CSV data from "stdin"')
             return None
 
-    else:
-        logname = os.path.join(logdir, f'{logprefix}_{logday}.log')
-        logger.info(f'Reading CSV data from file "{logname}"')
+        if isclean:
+            samples = _clean_samples(samples, isclosed=False)
+        return _project_samples(samples, usecols)
+
+    logname = _get_logname(logday, logprefix, logdir)
+
+    # Today is still growing. Only read what is new.
+    if logday >= ymd_today():
         if not os.path.isfile(logname):
             logger.warning(f'CSV data file not found "{logname}"')
             return None
-        
+        samples = _read_tail(logname, (logdir, logprefix))
+        if isclean:
+            samples = _clean_samples(samples, logday, isclosed=False)
+        return _project_samples(samples, usecols)
+
+    logsource = _get_logsource(logday, logprefix, logdir)
+    if logsource is None:
+        logger.warning(f'CSV data file not found "{logname}"')
+        return None
+
+    # Closed days never change. Use the data shared by another
+    # process or the binary store if valid.
+    mtime = _get_logmtime(logday, logprefix, logdir)
+    samples = _read_shared(logday, logprefix, logdir, mtime, usecols, isclean)
+    if samples is not None:
+        return samples
+
+    storename = _get_store_name(logname, isclean)
+    samples = _read_store(logsource, storename, usecols, mtime)
+    if (samples is None) and isclean:
+        # Clean all columns of the day once
+        samples = _get_log(logday, logprefix, logdir)
+        if samples is None:
+            return None
+
+        logger.info(f'Cleaning samples of "{logday}"')
+        samples = _clean_samples(samples, logday)
+        _write_store(storename, samples)
+    elif samples is None:
+        logger.info(f'Reading CSV data from file "{logsource}"')
         try:
             # We cannot make any assumption about the number of rows
-            samples = read_csv(logname, header=None)
+            samples = _read_logsource(logsource, logname)
         except:
-            logger.error(f'Erroneous CSV data file "{logname}"')
+            logger.error(f'Erroneous CSV data file "{logsource}"')
             return None
 
-    # With time new samples were added to the
-    # right. Name the remaining column names!
-    samples.columns = SAMPLE_NAMES[:len(samples.columns)]
-    samples = samples[samples.columns]
+        # The store gets all columns
+        _write_store(storename, samples)
 
-    # Cleanup
-    time = samples['TIME'].apply(t64_first)
-    # All colums but TIME are float
-    columns = samples.iloc[:,1:].astype(f64)        
+    samples = _project_samples(samples, usecols)
+    _write_shared(logday, logprefix, logdir, mtime, samples, usecols, isclean)
+    return samples
 
-    # TIME must not be index!
-    
-    return concat(
-        [time,columns], axis=1
-    ).drop_duplicates(
-        'TIME', keep='first'
-    )
+
+""" Only closed days without valid store are worth to be parsed in
+the process pool """
+def _is_pool_log(
+        logday: str,
+        logprefix: str,
+        logdir: str,
+        usecols: strings = None,
+        isclean: bool = False
+) -> bool:
+    if ((not has_log_workers()) or
+        (logday is None) or
+        (logprefix is None) or
+        (logdir is None) or
+        (logday >= ymd_today())):
+        return False
+    logsource = _get_logsource(logday, logprefix, logdir)
+    return ((logsource is not None) and
+            not _is_store_valid(
+                logsource,
+                _get_store_name(_get_logname(logday, logprefix, logdir), isclean),
+                _get_logmtime(logday, logprefix, logdir)
+            ))
 
 
 @cache
 async def get_log(
         logday: str = None,
         logprefix: str = None,
-        logdir: str = None
+        logdir: str = None,
+        usecols: strings = None,
+        isclean: bool = False
 ) -> DataFrame:
 
-    if sys.version_info >= (3, 9): 
+    if _is_pool_log(logday, logprefix, logdir, usecols, isclean):
+        log = await _get_pool_log(**vars())
+    elif sys.version_info >= (3, 9): 
         log = await asyncio.to_thread(_get_log, **vars())
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(0)
     else:
         log = _get_log(**vars())
 
@@ -183,15 +558,11 @@ async def get_sample_log(
         logprefix: str = None,
         logdir: str = None) -> Dict:
 
-    log = await get_log(
+    return await get_log(
         logday = logday,
         logprefix = logprefix,
-        logdir = logdir)
-    if log is None:
-        return None
-    
-    log = log[list(set(log.columns) & set(SAMPLE_NAMES))]
-    return log
+        logdir = logdir,
+        usecols = SAMPLE_NAMES)
 
 
 async def get_power_log(
@@ -199,15 +570,11 @@ async def get_power_log(
         logprefix: str = None,
         logdir: str = None) -> Dict:
 
-    log = await get_log(
+    return await get_log(
         logday = logday,
         logprefix = logprefix,
-        logdir = logdir)
-    if log is None:
-        return None
-    
-    log = log[list(set(log.columns) & set(POWER_NAMES))]
-    return log
+        logdir = logdir,
+        usecols = POWER_NAMES)
 
 
 async def get_predict_power_log(
@@ -215,15 +582,11 @@ async def get_predict_power_log(
         logprefix: str = None,
         logdir: str = None) -> Dict:
     
-    log = await get_log(
+    return await get_log(
         logday = logday,
         logprefix = logprefix,
-        logdir = logdir)
-    if log is None:
-        return None
-    
-    log = log[list(set(log.columns) & set(PREDICT_POWER_NAMES))]
-    return log
+        logdir = logdir,
+        usecols = PREDICT_POWER_NAMES)
 
 
 """ Get the list of logdays and the list of dataframes with the
@@ -243,28 +606,25 @@ async def get_logs(
         logdayformat
     ))[-logmaxdays:]
 
-    logtasks = [asyncio.create_task(
-        get_log(
-            ld, logprefix, logdir
-        )) for ld in logdays]
-    
     """ Get the list of associated columns """
-    logs = await asyncio.gather(*logtasks)
+    logs = await gather_bounded('disk', [
+        get_log(
+            ld, logprefix, logdir, usecols
+        ) for ld in logdays])
 
-    logs = [log[list(
-        set(log.columns) & set(usecols)
-    )] for log in logs if log is not None]
+    logs = [log for log in logs if log is not None]
 
     return logdays, logs
 
 
 """ Get the list of logdays and the list of dataframes with the
-required recordings """
+required recordings. The samples are cleaned if requested. """
 async def get_tunnel_logs(
         logwindow: int,
         logprefix: str,
         logdir: str,
-        usecols: str = POWER_NAMES
+        usecols: str = POWER_NAMES,
+        isclean: bool = False
 ) -> (List[str], List[DataFrame]):
 
     """ Get the list of logdays """
@@ -274,21 +634,190 @@ async def get_tunnel_logs(
         logdir,
     )
 
-    logtasks = [asyncio.create_task(
-        get_log(
-            ld, logprefix, logdir
-        )) for ld in logdays]
-    
     """ Get the list of associated columns """
-    logs = await asyncio.gather(*logtasks)
+    logs = await gather_bounded('disk', [
+        get_log(
+            ld, logprefix, logdir, usecols, isclean
+        ) for ld in logdays])
 
-    logs = [log[list(
-        set(log.columns) & set(usecols)
-    )] for log in logs if log is not None]
+    logs = [log for log in logs if log is not None]
 
     return logdays, logs
 
 
+""" Yield the logdays with their dataframes one after the other. The
+next 'prefetch' days are read in the background while the current day
+is processed. Only these days are held beyond the cache. Days without
+recordings are skipped. """
+async def _iter_logs(
+        logdays: strings,
+        logprefix: str,
+        logdir: str,
+        usecols: strings = POWER_NAMES,
+        prefetch: int = 2
+) -> AsyncIterator[tuple]:
+
+    logdays = iter(logdays)
+    logtasks = deque(
+        (ld, asyncio.create_task(get_log(ld, logprefix, logdir, usecols)))
+        for ld in islice(logdays, max(0, prefetch) + 1)
+    )
+    try:
+        while logtasks:
+            logday, logtask = logtasks.popleft()
+            log = await logtask
+
+            ld = next(logdays, None)
+            if ld is not None:
+                logtasks.append((ld, asyncio.create_task(
+                    get_log(ld, logprefix, logdir, usecols)
+                )))
+
+            if log is not None:
+                yield logday, log
+    finally:
+        # The consumer may stop early
+        for _, logtask in logtasks:
+            logtask.cancel()
+
+
+""" Stream the logdays and the dataframes with the required
+recordings. Same selection as 'get_logs' in constant memory """
+async def iter_logs(
+        logmaxdays: int,
+        logdayformat: str,
+        logprefix: str,
+        logdir: str,
+        usecols: strings = POWER_NAMES,
+        prefetch: int = 2
+) -> AsyncIterator[tuple]:
+
+    logdays = (await get_logdays(
+        logprefix,
+        logdir,
+        logdayformat
+    ))[-logmaxdays:]
+
+    async for logday, log in _iter_logs(
+            logdays, logprefix, logdir, usecols, prefetch
+    ):
+        yield logday, log
+
+
+""" Stream the tunnel logdays and the dataframes with the required
+recordings. Same selection as 'get_tunnel_logs' in constant memory """
+async def iter_tunnel_logs(
+        logwindow: int,
+        logprefix: str,
+        logdir: str,
+        usecols: strings = POWER_NAMES,
+        prefetch: int = 2
+) -> AsyncIterator[tuple]:
+
+    logdays = await get_tunnel_logdays(
+        logwindow,
+        logprefix,
+        logdir,
+    )
+
+    async for logday, log in _iter_logs(
+            logdays, logprefix, logdir, usecols, prefetch
+    ):
+        yield logday, log
+
+
+""" Read the closed logdays missing in the archive and archive them.
+Returns the grids and the start values of the counters of the days
+which could not be archived. """
+def _fill_archive(
+        logdays: strings,
+        mtimes: List[int],
+        logs: List[DataFrame],
+        logprefix: str,
+        logdir: str
+) -> Dict:
+    grids = {ld: _to_grid(ld, log)
+             for ld, log in zip(logdays, logs) if log is not None}
+    if len(grids) == 0:
+        return grids
+
+    archive = _get_logarchive(logprefix, logdir)
+    archive.put(
+        list(grids.keys()),
+        [mt for ld, mt in zip(logdays, mtimes) if ld in grids],
+        [g for g, _ in grids.values()],
+        [b for _, b in grids.values()]
+    )
+    rows = archive.get_rows(logdays, mtimes)
+    return {ld: g for (ld, g), r in zip(grids.items(), rows) if r is None}
+
+
+""" Return the logdays with samples, their samples on the grid of
+minutes with the columns of SAMPLE_NAMES and the start values of the
+counters. The counters on the grid are relative to their start value.
+Closed logdays are read once and then taken from the archive.
+Consecutive archived logdays are a view into the archive. Today is put
+onto the grid on each call. """
+async def get_archive_logs(
+        logdays: strings,
+        logprefix: str,
+        logdir: str
+) -> (strings, np.ndarray, np.ndarray):
+
+    archive = _get_logarchive(logprefix, logdir)
+    today = ymd_today()
+
+    closeddays = [ld for ld in logdays if ld < today]
+    mtimes = await get_logmtimes(closeddays, logprefix, logdir)
+    rows = await asyncio.to_thread(archive.get_rows, closeddays, mtimes)
+
+    """ Archive the missing closed logdays """
+
+    missing = [i for i, (r, mt) in enumerate(zip(rows, mtimes))
+               if (r is None) and (mt is not None)]
+    grids = dict()
+    if len(missing) > 0:
+        logs = await gather_bounded('disk', [
+            get_log(closeddays[i], logprefix, logdir) for i in missing
+        ])
+        grids = await asyncio.to_thread(
+            _fill_archive,
+            [closeddays[i] for i in missing],
+            [mtimes[i] for i in missing],
+            logs,
+            logprefix,
+            logdir
+        )
+        rows = await asyncio.to_thread(archive.get_rows, closeddays, mtimes)
+
+    """ The open logdays are never archived """
+
+    for ld in logdays:
+        if ld < today: continue
+        log = await get_log(ld, logprefix, logdir)
+        if log is not None:
+            grids[ld] = _to_grid(ld, log)
+
+    archived = dict(
+        (ld, r) for ld, r in zip(closeddays, rows) if r is not None
+    )
+    days = [ld for ld in logdays if (ld in archived) or (ld in grids)]
+
+    if len(grids) == 0:
+        return (days, *await asyncio.to_thread(
+            archive.get_grids, [archived[ld] for ld in days]
+        ))
+
+    gridbases = [
+        grids[ld] if ld in grids else
+        tuple(a[0] for a in archive.get_grids([archived[ld]]))
+        for ld in days
+    ]
+    return (days,
+            np.stack([g for g, _ in gridbases]),
+            np.stack([b for _, b in gridbases]))
+
+
 """ Get the dataframe with the list of logdays and the list of
 dataframes with the required recordings """
 async def get_logs_df(
@@ -299,14 +828,18 @@ async def get_logs_df(
         usecols:str = POWER_NAMES,
 ) -> DataFrame:
 
-    days, logs = await get_logs(
-        logmaxdays,
-        logdayformat,
+    logdays = (await get_logdays(
         logprefix,
         logdir,
-        usecols
+        logdayformat
+    ))[-logmaxdays:]
+
+    days, grids, bases = await get_archive_logs(
+        logdays,
+        logprefix,
+        logdir
     )
-    return concat(logs, keys=days)
+    return await asyncio.to_thread(_from_grid, days, grids, bases, usecols)
 
 
 """ Get the dataframe with the list of tunnel logdays and the list
@@ -318,10 +851,15 @@ async def get_tunnel_logs_df(
         usecols:str = POWER_NAMES,
 ) -> DataFrame:
 
-    days, logs = await get_tunnel_logs(
+    logdays = await get_tunnel_logdays(
         logwindow,
         logprefix,
         logdir,
-        usecols
     )
-    return concat(logs, keys=days)
+
+    days, grids, bases = await get_archive_logs(
+        logdays,
+        logprefix,
+        logdir
+    )
+    return await asyncio.to_thread(_from_grid, days, grids, bases, usecols)
@@ -0,0 +1,292 @@
+__doc__=""" Append-only archive of closed log days on a fixed grid of
+minutes. The samples of all days are kept as one memory-mapped float32
+array with the shape days x minutes x columns. The TIME column holds
+the minute of the day, NaN marks minutes without samples. The energy
+counters are kept relative to their first sample of the day, which
+float32 holds without loss. Their start values are kept as float64 in
+the day index next to the array. The index maps the logdays to their
+rows. Consecutive days are returned as views into the mapped file.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import os.path
+import fcntl
+import tempfile
+import threading
+
+from datetime import datetime
+
+import numpy as np
+
+from ..typing import(
+    f32, f64, List, strings
+)
+from ..common import(
+    SAMPLE_NAMES
+)
+from pandas import(
+    DataFrame,
+    MultiIndex
+)
+
+MINUTES = 24*60
+
+ARCHIVE_NAMES = SAMPLE_NAMES
+
+""" The cumulative energy counters """
+COUNTER_NAMES = ['SME', 'IVE1', 'IVTE1', 'IVE2', 'IVTE2']
+
+ARCHIVE_DATA_EXT = '_archive.f32'
+ARCHIVE_INDEX_EXT = '_archive.npz'
+
+
+""" Return the start of the logday """
+def _get_daystart(
+        logday: str
+) -> np.datetime64:
+    return np.datetime64(datetime.strptime(logday, '%y%m%d'), 'ns')
+
+
+""" Put the samples of a logday onto the grid of minutes. Returns the
+grid and the start values of the counters. """
+def _to_grid(
+        logday: str,
+        samples: DataFrame
+) -> (np.ndarray, np.ndarray):
+    grid = np.full((MINUTES, len(ARCHIVE_NAMES)), np.nan, dtype=f32)
+    base = np.full(len(COUNTER_NAMES), np.nan, dtype=f64)
+
+    minutes = (
+        (samples['TIME'].to_numpy() - _get_daystart(logday)) //
+        np.timedelta64(1, 'm')
+    ).astype(np.int64)
+    isday = (minutes >= 0) & (minutes < MINUTES)
+    if not isday.all():
+        logger.warning(
+            f'Dropped "{(~isday).sum()}" samples outside of logday "{logday}"')
+    minutes = minutes[isday]
+
+    grid[minutes, 0] = minutes
+    for i, c in enumerate(ARCHIVE_NAMES[1:], 1):
+        if c not in samples:
+            continue
+        values = samples[c].to_numpy(dtype=f64)[isday]
+        if c in COUNTER_NAMES:
+            isvalid = ~np.isnan(values)
+            if isvalid.any():
+                j = COUNTER_NAMES.index(c)
+                base[j] = values[isvalid][0]
+                values = values - base[j]
+        grid[minutes, i] = values
+    return grid, base
+
+
+""" Return the samples of the logdays on the grid as one dataframe
+with the logdays as first index level. The counters are restored from
+their start values. Minutes without samples are skipped and columns
+without any sample are dropped. """
+def _from_grid(
+        logdays: strings,
+        grids: np.ndarray,
+        bases: np.ndarray,
+        usecols: strings = None
+) -> DataFrame:
+    ndays = len(logdays)
+    flat = grids.reshape(ndays*MINUTES, len(ARCHIVE_NAMES))
+
+    ispresent = ~np.isnan(flat[:,0])
+    counts = ispresent.reshape(ndays, MINUTES).sum(axis=1)
+    days = np.repeat(np.arange(ndays), counts)
+    rows = np.arange(days.size) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    starts = np.array([_get_daystart(ld) for ld in logdays], dtype='datetime64[ns]')
+    minutes = flat[ispresent, 0].astype(np.int64)
+    data = {'TIME': starts[days] + minutes*np.timedelta64(1, 'm')}
+    for i, c in enumerate(ARCHIVE_NAMES[1:], 1):
+        if (usecols is not None) and (c not in usecols):
+            continue
+        values = flat[ispresent, i].astype(f64)
+        if c in COUNTER_NAMES:
+            values += bases[days, COUNTER_NAMES.index(c)]
+        if not np.isnan(values).all():
+            data[c] = values
+
+    return DataFrame(
+        data,
+        index=MultiIndex.from_arrays(
+            [np.array(logdays)[days], rows]
+        )
+    )
+
+
+class LogArchive:
+
+    def __init__(self, logprefix: str, logdir: str):
+        self.dataname = os.path.join(logdir, f'{logprefix}{ARCHIVE_DATA_EXT}')
+        self.indexname = os.path.join(logdir, f'{logprefix}{ARCHIVE_INDEX_EXT}')
+        self.lock = threading.Lock()
+        self.imtime = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.logdays = []
+        self.mtimes = []
+        self.rows = dict()
+        self.bases = np.empty((0, len(COUNTER_NAMES)), dtype=f64)
+        self.data = None
+
+    """ Load the day index and map the array. Only done again if
+    another process or thread changed the index """
+    def _load(self) -> None:
+        try:
+            imtime = os.stat(self.indexname).st_mtime_ns
+        except OSError:
+            imtime = None
+
+        if imtime == self.imtime:
+            return
+
+        self._reset()
+        self.imtime = imtime
+        if imtime is None:
+            return
+
+        logger.info(f'Mapping archive "{self.dataname}"')
+        try:
+            with np.load(self.indexname, allow_pickle=False) as index:
+                logdays = index['LOGDAY'].tolist()
+                mtimes = index['MTIME'].tolist()
+                names = index['NAMES'].tolist()
+                bases = index['BASE'] if 'BASE' in index else None
+            if (names != ARCHIVE_NAMES) or (bases is None):
+                logger.error(f'Incompatible archive "{self.dataname}"')
+                return
+            if len(logdays) > 0:
+                self.data = np.memmap(
+                    self.dataname, dtype=f32, mode='r',
+                    shape=(len(logdays), MINUTES, len(ARCHIVE_NAMES))
+                )
+        except Exception:
+            logger.error(f'Erroneous archive "{self.dataname}"')
+            self._reset()
+            return
+
+        self.logdays = logdays
+        self.mtimes = mtimes
+        self.bases = bases
+        self.rows = {ld: r for r, ld in enumerate(logdays)}
+
+    """ Return the rows of the logdays. The row is None if the logday is
+    not archived or if its log file changed. A logday without log file
+    keeps its row. """
+    def get_rows(self, logdays: strings, mtimes: List[int]) -> List[int]:
+        with self.lock:
+            self._load()
+            rows = [self.rows.get(ld) for ld in logdays]
+            return [r if ((r is not None) and
+                          ((mt is None) or (self.mtimes[r] == mt)))
+                    else None for r, mt in zip(rows, mtimes)]
+
+    """ Return the grids and the start values of the counters of the
+    rows. Consecutive rows are a view into the mapped file, all others a
+    copy """
+    def get_grids(self, rows: List[int]) -> (np.ndarray, np.ndarray):
+        with self.lock:
+            self._load()
+            data, bases = self.data, self.bases
+        rows = np.array(rows, dtype=np.int64)
+        if rows.size == 0:
+            return (np.empty((0, MINUTES, len(ARCHIVE_NAMES)), dtype=f32),
+                    np.empty((0, len(COUNTER_NAMES)), dtype=f64))
+        if (np.diff(rows) == 1).all():
+            return data[rows[0]:rows[-1]+1], bases[rows]
+        return data[rows], bases[rows]
+
+    """ Write the grids of the logdays. Known logdays are overwritten in
+    place, new logdays are appended. The file lock serializes writers of
+    different processes """
+    def put(
+            self,
+            logdays: strings,
+            mtimes: List[int],
+            grids: List[np.ndarray],
+            bases: List[np.ndarray]
+    ) -> bool:
+        rowbytes = MINUTES*len(ARCHIVE_NAMES)*np.dtype(f32).itemsize
+        tempname = None
+
+        logger.info(f'Writing "{len(logdays)}" days to archive "{self.dataname}"')
+        with self.lock:
+            try:
+                fd = os.open(self.dataname, os.O_RDWR | os.O_CREAT, 0o644)
+                with os.fdopen(fd, 'r+b') as f:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                    self._load()
+                    alldays, allmtimes = list(self.logdays), list(self.mtimes)
+                    allbases = list(self.bases)
+                    rows = dict(self.rows)
+
+                    # Drop the rest of an interrupted append
+                    f.truncate(len(alldays)*rowbytes)
+                    for ld, mt, grid, base in zip(logdays, mtimes, grids, bases):
+                        if ld not in rows:
+                            rows[ld] = len(alldays)
+                            alldays.append(ld)
+                            allmtimes.append(mt)
+                            allbases.append(base)
+                        allmtimes[rows[ld]] = mt
+                        allbases[rows[ld]] = base
+                        f.seek(rows[ld]*rowbytes)
+                        f.write(np.ascontiguousarray(grid, dtype=f32).tobytes())
+                    f.flush()
+
+                    fd, tempname = tempfile.mkstemp(
+                        suffix='.tmp', dir=os.path.dirname(self.indexname) or '.'
+                    )
+                    with os.fdopen(fd, 'wb') as i:
+                        np.savez(
+                            i,
+                            LOGDAY=np.array(alldays, dtype=str),
+                            MTIME=np.array(
+                                [-1 if mt is None else mt for mt in allmtimes],
+                                dtype=np.int64
+                            ),
+                            NAMES=np.array(ARCHIVE_NAMES, dtype=str),
+                            BASE=np.array(allbases, dtype=f64).reshape(
+                                -1, len(COUNTER_NAMES)
+                            )
+                        )
+                    os.replace(tempname, self.indexname)
+                    self.imtime = None
+                    self._load()
+            except OSError:
+                logger.warning(f'Cannot write archive "{self.dataname}"')
+                if tempname is not None and os.path.isfile(tempname):
+                    os.remove(tempname)
+                return False
+
+        return True
+
+
+ARCHIVES = dict()
+ARCHIVES_LOCK = threading.Lock()
+
+""" Return the archive for the log files with prefix in the directory """
+def _get_logarchive(
+        logprefix: str,
+        logdir: str
+) -> LogArchive:
+    key = (logdir, logprefix)
+    with ARCHIVES_LOCK:
+        if key not in ARCHIVES:
+            ARCHIVES[key] = LogArchive(logprefix, logdir)
+        return ARCHIVES[key]
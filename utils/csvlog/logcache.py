@@ -0,0 +1,111 @@
+__doc__=""" Bounded in-memory cache for the samples of log days. The
+entries are evicted least recently used first when the memory budget
+is exceeded. An entry is invalid once the modification time of its
+log file changes.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+from collections import(
+    OrderedDict
+)
+
+from ..typing import(
+    Any, Dict
+)
+from pandas import(
+    DataFrame
+)
+
+CACHE_MAX_MB = 256
+
+
+""" Return the number of bytes held by a cached value """
+def _get_nbytes(data: Any) -> int:
+    if isinstance(data, DataFrame):
+        return int(data.memory_usage(index=True, deep=True).sum())
+    return 0
+
+
+class LogCache:
+
+    def __init__(self, maxmb: float = CACHE_MAX_MB):
+        self.entries = OrderedDict()
+        self.maxbytes = int(maxmb*1024*1024)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self.entries
+
+    def get(self, key: tuple, mtime: int) -> (bool, Any):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        emtime, enbytes, edata = entry
+        if emtime != mtime:
+            logger.info(f'Log file of "{key[-1]}" changed. Invalidate!')
+            self._remove(key)
+            self.misses += 1
+            return False, None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return True, edata
+
+    def put(self, key: tuple, mtime: int, data: Any) -> None:
+        if key in self.entries:
+            self._remove(key)
+
+        nbytes = _get_nbytes(data)
+        if nbytes > self.maxbytes:
+            logger.warning(f'Values of "{key[-1]}" exceed cache size')
+            return
+
+        self.entries[key] = (mtime, nbytes, data)
+        self.nbytes += nbytes
+        self._shrink(self.maxbytes)
+
+    def resize(self, maxmb: float) -> None:
+        self.maxbytes = int(maxmb*1024*1024)
+        self._shrink(self.maxbytes)
+
+    """ Return the keys from the least to the most recently used """
+    def keys(self) -> list:
+        return list(self.entries.keys())
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.nbytes = 0
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self.entries),
+            'nbytes': self.nbytes,
+            'maxbytes': self.maxbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+    def _remove(self, key: tuple) -> None:
+        _, nbytes, _ = self.entries.pop(key)
+        self.nbytes -= nbytes
+
+    def _shrink(self, maxbytes: int) -> None:
+        while self.nbytes > maxbytes and self.entries:
+            key, (_, nbytes, _) = self.entries.popitem(last=False)
+            self.nbytes -= nbytes
+            self.evictions += 1
+            logger.info(f'Evicted values of "{key[-1]}" from cache')
@@ -0,0 +1,119 @@
+__doc__=""" Cleaning of the log days. The samples of a day are put onto
+the minutes of the day. Minutes without sample get the nearest sample.
+The known faults of the SBPI readings of the Solix are repaired with
+the inverter powers. The QUALITY column flags the changed minutes.
+
+Closed days are cleaned once when they are read first and then kept in
+their own binary store. Readers of cleaned days do not repair again.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import numpy as np
+
+from datetime import datetime
+
+from ..typing import(
+    f64
+)
+from pandas import(
+    DataFrame
+)
+
+MINUTES = 24*60
+
+""" The flags of the QUALITY column """
+QUALITY_FILLED = 1 # No sample in the minute. The nearest one is used
+QUALITY_FROZEN = 2 # SBPI did not change. Replaced by the inverters
+QUALITY_LAZY = 4   # SBPI below the inverters. Replaced by the inverters
+
+""" The minimum number of equal SBPI samples of a frozen Solix """
+FROZEN_MINUTES = 15
+
+
+""" Return the mask of the minutes with frozen SBPI samples. Only
+measured minutes with power count. """
+def _get_frozen(
+        sbpi: np.ndarray,
+        ismeasured: np.ndarray
+) -> np.ndarray:
+    isfrozen = np.zeros(sbpi.size, dtype=bool)
+
+    on = np.flatnonzero(ismeasured & (sbpi > 0))
+    if on.size < FROZEN_MINUTES:
+        return isfrozen
+
+    issame = np.concatenate(([0], (sbpi[on[1:]] == sbpi[on[:-1]]).astype(np.int8), [0]))
+    edges = np.diff(issame)
+    for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+        if end - start + 1 >= FROZEN_MINUTES:
+            isfrozen[on[start]:on[end]+1] = True
+    return isfrozen & (sbpi > 0)
+
+
+""" Return the samples of a day on its minutes with the QUALITY column.
+Closed days get all minutes, open days the minutes up to the last
+sample. Samples outside of the logday are dropped. Without logday the
+day of the first sample is used. The samples must be fixed already. """
+def _clean_samples(
+        samples: DataFrame,
+        logday: str = None,
+        isclosed: bool = True
+) -> DataFrame:
+    if (samples is None) or (len(samples) == 0):
+        return samples
+
+    times = samples['TIME'].to_numpy()
+    if logday is None:
+        daystart = times.min().astype('datetime64[D]')
+    else:
+        daystart = np.datetime64(datetime.strptime(logday, '%y%m%d').date(), 'D')
+    minutes = ((times - daystart) // np.timedelta64(1, 'm')).astype(np.int64)
+
+    # The first sample of each minute of the day
+    rows = np.flatnonzero((minutes >= 0) & (minutes < MINUTES))
+    if rows.size == 0:
+        logger.warning(f'No samples of logday "{logday}"')
+        return samples.iloc[:0].assign(QUALITY=np.array([], dtype=f64))
+    minutes, first = np.unique(minutes[rows], return_index=True)
+    rows = rows[first]
+
+    grid = np.arange(MINUTES if isclosed else minutes[-1] + 1)
+    right = np.searchsorted(minutes, grid).clip(max=minutes.size - 1)
+    left = (right - 1).clip(min=0)
+    nearest = np.where(
+        np.abs(grid - minutes[left]) <= np.abs(minutes[right] - grid),
+        left, right
+    )
+
+    quality = np.where(minutes[nearest] == grid, 0, QUALITY_FILLED)
+    cleaned = {'TIME': (daystart + grid*np.timedelta64(1, 'm')).astype('datetime64[ns]')}
+    for c in samples.columns[1:]:
+        cleaned[c] = samples[c].to_numpy()[rows][nearest]
+
+    if ('SBPI' in cleaned) and (('IVP1' in cleaned) or ('IVP2' in cleaned)):
+        sbpi = cleaned['SBPI'] = cleaned['SBPI'].astype(f64)
+        ivp = (cleaned.get('IVP1', 0) + cleaned.get('IVP2', 0)).astype(f64)
+
+        isfrozen = _get_frozen(sbpi, quality == 0)
+        if isfrozen.any():
+            logger.info(f'Solix has frozen in "{isfrozen.sum()}" minutes')
+            sbpi[isfrozen] = ivp[isfrozen]
+            quality[isfrozen] |= QUALITY_FROZEN
+
+        islazy = ivp > sbpi
+        if 'SBPB' in cleaned:
+            islazy &= ~(cleaned['SBPB'] > 0)
+        sbpi[islazy] = ivp[islazy]
+        quality[islazy] |= QUALITY_LAZY
+
+    # All columns but TIME are float
+    cleaned['QUALITY'] = quality.astype(f64)
+    return DataFrame(cleaned)
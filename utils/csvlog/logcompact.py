@@ -0,0 +1,159 @@
+__doc__=""" Compaction of the log files of closed days. The CSV log
+files are compressed with gzip. Optionally all days of a closed month
+are merged into one zip archive. The modification times of the log
+files are kept, in the archive as the comment of each member. Binary
+stores, caches and archives of the days remain valid.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import os.path
+import gzip
+import shutil
+import zipfile
+import tempfile
+
+from datetime import(
+    datetime,
+    timedelta
+)
+
+from ..typing import(
+    Dict
+)
+from .logindex import(
+    _get_logindex,
+    LOGEXT,
+    GZEXT,
+    ZIPEXT
+)
+
+
+""" Replace the log file by its gzip compressed copy """
+def _gzip_log(
+        logname: str
+) -> bool:
+    stat = os.stat(logname)
+    tempname = None
+    try:
+        fd, tempname = tempfile.mkstemp(
+            suffix='.tmp', dir=os.path.dirname(logname) or '.'
+        )
+        with open(logname, 'rb') as src, os.fdopen(fd, 'wb') as raw:
+            with gzip.GzipFile(
+                    filename=os.path.basename(logname),
+                    mode='wb', fileobj=raw, mtime=int(stat.st_mtime)
+            ) as dst:
+                shutil.copyfileobj(src, dst)
+        os.utime(tempname, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tempname, logname + GZEXT)
+        os.remove(logname)
+    except OSError:
+        logger.error(f'Cannot compress "{logname}"')
+        if tempname is not None and os.path.isfile(tempname):
+            os.remove(tempname)
+        return False
+
+    logger.info(f'Compressed "{logname}"')
+    return True
+
+
+""" Merge the log files of the month into the archive of the month. The
+days already in the archive are kept. The comment of a member holds
+the modification time of its log file in nanoseconds """
+def _zip_month(
+        logmonth: str,
+        logsources: Dict,
+        logprefix: str,
+        logdir: str
+) -> bool:
+    zipname = os.path.join(logdir, f'{logprefix}_{logmonth}{ZIPEXT}')
+    sources = {f'{logprefix}_{ld}{LOGEXT}': s
+               for ld, s in logsources.items() if s != zipname}
+    if len(sources) == 0:
+        return True
+
+    mtimes = [os.stat(s).st_mtime_ns for s in sources.values()]
+    if os.path.isfile(zipname):
+        mtimes.append(os.stat(zipname).st_mtime_ns)
+    mtime = max(mtimes)
+
+    tempname = None
+    try:
+        fd, tempname = tempfile.mkstemp(suffix='.tmp', dir=logdir)
+        with os.fdopen(fd, 'wb') as raw, zipfile.ZipFile(
+                raw, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9
+        ) as dst:
+            if os.path.isfile(zipname):
+                with zipfile.ZipFile(zipname) as src:
+                    for info in src.infolist():
+                        if info.filename not in sources:
+                            dst.writestr(info, src.read(info))
+            for member, source in sources.items():
+                opener = gzip.open if source.endswith(GZEXT) else open
+                with opener(source, 'rb') as src:
+                    stat = os.stat(source)
+                    info = zipfile.ZipInfo(
+                        member,
+                        datetime.fromtimestamp(stat.st_mtime).timetuple()[:6]
+                    )
+                    info.comment = str(stat.st_mtime_ns).encode()
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    dst.writestr(info, src.read())
+        os.utime(tempname, ns=(mtime, mtime))
+        os.replace(tempname, zipname)
+    except (OSError, zipfile.BadZipFile):
+        logger.error(f'Cannot merge month "{logmonth}"')
+        if tempname is not None and os.path.isfile(tempname):
+            os.remove(tempname)
+        return False
+
+    for source in sources.values():
+        os.remove(source)
+
+    logger.info(f'Merged "{len(sources)}" days into "{zipname}"')
+    return True
+
+
+""" Compress the log files of the days older than 'keepdays'. Merge
+closed months into a single archive if requested. Returns the number
+of log files which could not be compacted. """
+def compact_logs(
+        logprefix: str,
+        logdir: str,
+        keepdays: int = 7,
+        merge: bool = False
+) -> int:
+    keepday = (
+        datetime.today() - timedelta(days=max(1, keepdays))
+    ).strftime('%y%m%d')
+
+    index = _get_logindex(logprefix, logdir)
+    logdays = [ld for ld in index.get_logdays() if ld < keepday]
+
+    failed = 0
+    for ld in logdays:
+        logsource = index.get_logsource(ld)
+        if logsource.endswith(LOGEXT):
+            failed += 0 if _gzip_log(logsource) else 1
+
+    if not merge:
+        return failed
+
+    logmonths = dict()
+    for ld in logdays:
+        # Only months completely before the kept days
+        if ld[:4] < keepday[:4]:
+            logmonths.setdefault(ld[:4], dict())[ld] = index.get_logsource(ld)
+    for lm, sources in logmonths.items():
+        failed += 0 if _zip_month(lm, sources, logprefix, logdir) else len(sources)
+
+    return failed
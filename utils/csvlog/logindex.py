@@ -0,0 +1,203 @@
+__doc__=""" In-process index of the log days in a log directory. The
+directory is only listed again if its modification time changes. The
+month archives are only read again if the log files or the archives
+changed, not for the stores and tables written next to them. Days,
+months and years are kept as sorted arrays.
+
+Closed days may be compressed or merged into the archive of their
+month. The index knows which file holds the samples of a day and the
+modification time of the log file of a day in an archive.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import zipfile
+import threading
+
+from fnmatch import fnmatchcase
+
+import numpy as np
+
+from ..typing import(
+    Dict, strings
+)
+
+LOGEXT = '.log'
+GZEXT = '.gz'
+ZIPEXT = '.zip'
+
+
+class LogIndex:
+
+    def __init__(self, logprefix: str, logdir: str):
+        self.logprefix = logprefix
+        self.logdir = logdir
+        self.mtime = None
+        self.signature = None
+        self.lock = threading.Lock()
+        self.sources = dict()
+        self.mtimes = dict()
+        self.logdays = np.array([], dtype=str)
+        self.logmmdds = np.array([], dtype=str)
+        self.logmonths = np.array([], dtype=str)
+        self.logyears = np.array([], dtype=str)
+
+    """ Return the names of the files with samples and the modification
+    times of the month archives. Other files are ignored. """
+    def _list(self) -> tuple:
+        head = f'{self.logprefix}_'
+        names, mtimes = [], []
+        with os.scandir(self.logdir) as entries:
+            for e in entries:
+                if not e.name.startswith(head):
+                    continue
+                if e.name.endswith(ZIPEXT):
+                    try:
+                        mtimes.append(e.stat().st_mtime_ns)
+                    except OSError:
+                        continue
+                elif not e.name.endswith((LOGEXT, LOGEXT + GZEXT)):
+                    continue
+                names.append(e.name)
+        return tuple(sorted(names)), tuple(sorted(mtimes))
+
+    """ Return the files with the samples of the logdays and the
+    modification times of the days in the month archives. A plain log
+    file is preferred to a compressed one and this to a month
+    archive. """
+    def _scan(self, names: strings) -> (Dict, Dict):
+        head = f'{self.logprefix}_'
+        sources, mtimes = dict(), dict()
+
+        for name in names:
+            if not name.endswith(ZIPEXT):
+                continue
+            try:
+                with zipfile.ZipFile(os.path.join(self.logdir, name)) as z:
+                    members = z.infolist()
+            except (OSError, zipfile.BadZipFile):
+                logger.error(f'Erroneous month archive "{name}"')
+                continue
+            for m in members:
+                if m.filename.startswith(head) and m.filename.endswith(LOGEXT):
+                    logday = m.filename[len(head):-len(LOGEXT)]
+                    sources[logday] = name
+                    if m.comment.isdigit():
+                        mtimes[logday] = int(m.comment)
+
+        for name in names:
+            if name.endswith(LOGEXT + GZEXT):
+                sources[name[len(head):-len(LOGEXT + GZEXT)]] = name
+        for name in names:
+            if name.endswith(LOGEXT):
+                sources[name[len(head):-len(LOGEXT)]] = name
+
+        return sources, mtimes
+
+    def refresh(self) -> None:
+        with self.lock:
+            try:
+                mtime = os.stat(self.logdir).st_mtime_ns
+            except OSError:
+                logger.warning(f'Log directory not found "{self.logdir}"')
+                mtime = None
+
+            if (mtime is not None) and (mtime == self.mtime):
+                return
+
+            signature = None
+            if mtime is not None:
+                try:
+                    signature = self._list()
+                except OSError:
+                    logger.warning(f'Log directory not listed "{self.logdir}"')
+                    mtime = None
+            self.mtime = mtime
+
+            if (signature is not None) and (signature == self.signature):
+                return
+
+            logger.info(f'Indexing log days in "{self.logdir}"')
+            self.sources, self.mtimes = (
+                self._scan(signature[0]) if signature is not None else (dict(), dict())
+            )
+            self.signature = signature
+            logdays = np.sort(np.array(list(self.sources), dtype=str))
+            self.logdays = logdays
+            self.logmmdds = np.array([ld[2:] for ld in logdays], dtype=str)
+            self.logmonths = np.unique([ld[:-2] for ld in logdays]).astype(str)
+            self.logyears = np.unique([ld[:2] for ld in logdays]).astype(str)
+
+    def get_logdays(self, logdayformat: str = '*') -> strings:
+        self.refresh()
+        logdays = self.logdays.tolist()
+        if logdayformat != '*':
+            logdays = [ld for ld in logdays if fnmatchcase(ld, logdayformat)]
+        return logdays
+
+    """ Return the path of the file with the samples of the logday. None
+    if there is none """
+    def get_logsource(self, logday: str) -> str:
+        self.refresh()
+        source = self.sources.get(logday)
+        return None if source is None else os.path.join(self.logdir, source)
+
+    """ Return the modification time of the log file of the logday in
+    nanoseconds. A day in a month archive has the time of its log file
+    before the merge. Archives without it give their own time. None if
+    there is no log file """
+    def get_logmtime(self, logday: str) -> int:
+        self.refresh()
+        source = self.sources.get(logday)
+        if source is None:
+            return None
+        if source.endswith(ZIPEXT) and (logday in self.mtimes):
+            return self.mtimes[logday]
+        try:
+            return os.stat(os.path.join(self.logdir, source)).st_mtime_ns
+        except OSError:
+            return None
+
+    def get_logmonths(self) -> strings:
+        self.refresh()
+        return self.logmonths.tolist()
+
+    def get_logyears(self) -> strings:
+        self.refresh()
+        return self.logyears.tolist()
+
+    """ Return the logdays in the windows around the same day of the
+    year of the latest logday in each year. The latest logday is the
+    last item in the returned list """
+    def get_tunnel_logdays(self, logwindow: int) -> strings:
+        self.refresh()
+        logdays, logmmdds = self.logdays, self.logmmdds
+        if logdays.size == 0:
+            return []
+        n = logdays.size
+        centers = np.flatnonzero(logmmdds == logmmdds[-1])
+        return [ld for c in centers
+                for ld in logdays[max(0,c-logwindow):min(n,c+logwindow+1)].tolist()]
+
+
+INDEXES = dict()
+INDEXES_LOCK = threading.Lock()
+
+""" Return the index for the log files with prefix in the directory """
+def _get_logindex(
+        logprefix: str,
+        logdir: str
+) -> LogIndex:
+    key = (logdir, logprefix)
+    with INDEXES_LOCK:
+        if key not in INDEXES:
+            INDEXES[key] = LogIndex(logprefix, logdir)
+        return INDEXES[key]
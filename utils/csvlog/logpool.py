@@ -0,0 +1,187 @@
+__doc__=""" Optional process pool to parse the CSV log files of closed
+days on all cores. Parsing holds the GIL, so threads do not run in
+parallel. The workers return the parsed samples over shared memory
+with the dtypes of their columns.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import asyncio
+
+from multiprocessing import(
+    get_context
+)
+from multiprocessing.shared_memory import(
+    SharedMemory
+)
+from concurrent.futures import(
+    ProcessPoolExecutor
+)
+
+import numpy as np
+
+from ..typing import(
+    strings
+)
+from . import(
+    logshared
+)
+from pandas import(
+    DataFrame
+)
+
+LOGPOOL = None
+
+
+""" Start the pool with the number of workers. Zero workers stops the
+pool. The logs are then parsed in threads again. """
+def set_log_workers(
+        workers: int
+) -> None:
+    global LOGPOOL
+
+    if LOGPOOL is not None:
+        LOGPOOL.shutdown(wait=False)
+        LOGPOOL = None
+
+    workers = min(workers, os.cpu_count() or 1)
+    if workers > 0:
+        logger.info(f'Parsing logs with "{workers}" worker processes')
+        LOGPOOL = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context('spawn')
+        )
+
+def has_log_workers() -> bool:
+    return LOGPOOL is not None
+
+
+""" Return True if all columns have a numpy dtype of up to eight bytes,
+so they can be passed by shared memory """
+def _is_shareable(
+        samples: DataFrame
+) -> bool:
+    return all(isinstance(d, np.dtype) and (d.kind in 'biufmM') and
+               (d.itemsize <= 8) for d in samples.dtypes)
+
+""" Copy the samples into a new shared memory block with one row of
+eight bytes per sample for each column. The raw bytes of each column
+are stored with its dtype """
+def _to_shared(
+        samples: DataFrame
+) -> (str, strings, strings, int):
+
+    names = list(samples.columns)
+    nrows = len(samples)
+
+    shm = SharedMemory(create=True, size=max(1, len(names)*nrows*8))
+    block = np.ndarray((len(names), nrows*8), dtype=np.uint8, buffer=shm.buf)
+    dtypes = []
+    for i, c in enumerate(names):
+        values = np.ascontiguousarray(samples[c].to_numpy())
+        dtypes.append(values.dtype.str)
+        block[i, :values.nbytes] = values.view(np.uint8)
+    del block
+    shm.close()
+
+    return shm.name, names, dtypes, nrows
+
+""" Copy the samples out of the shared memory block with the dtypes
+of the columns and release it """
+def _from_shared(
+        name: str,
+        names: strings,
+        dtypes: strings,
+        nrows: int
+) -> DataFrame:
+
+    shm = SharedMemory(name=name)
+    try:
+        block = np.ndarray((len(names), nrows*8), dtype=np.uint8, buffer=shm.buf)
+        data = dict()
+        for i, (c, d) in enumerate(zip(names, dtypes)):
+            d = np.dtype(d)
+            data[c] = block[i, :nrows*d.itemsize].view(d).copy()
+        del block
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return DataFrame(data)
+
+
+""" Release the shared memory block of a parse nobody waits for any
+more """
+def _release_shared(
+        future
+) -> None:
+    if future.cancelled() or (future.exception() is not None):
+        return
+    shared = future.result()
+    if (shared is None) or isinstance(shared, DataFrame):
+        return
+    try:
+        shm = SharedMemory(name=shared[0])
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+    logger.info(f'Released shared samples of a cancelled parse')
+
+
+""" Runs in the worker process. The worker uses the shared cache of the
+parent """
+def _get_log_shared(
+        logday: str,
+        logprefix: str,
+        logdir: str,
+        usecols: strings = None,
+        isclean: bool = False,
+        shareddir: str = None,
+        sharedmb: float = None
+) -> (str, strings, strings, int):
+    from .csvlog import _get_log
+
+    logshared.SHARED_DIR = shareddir
+    if sharedmb is not None:
+        logshared.SHARED_MAX_MB = sharedmb
+
+    samples = _get_log(logday, logprefix, logdir, usecols, isclean)
+    if samples is None:
+        return None
+    if not _is_shareable(samples):
+        # Rare columns of other types are pickled
+        return samples
+    return _to_shared(samples)
+
+
+""" Parse the log of a closed day in a worker process """
+async def _get_pool_log(
+        logday: str,
+        logprefix: str,
+        logdir: str,
+        usecols: strings = None,
+        isclean: bool = False
+) -> DataFrame:
+
+    future = LOGPOOL.submit(
+        _get_log_shared, logday, logprefix, logdir, usecols, isclean,
+        logshared.SHARED_DIR, logshared.SHARED_MAX_MB
+    )
+    try:
+        shared = await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        # The worker may still create the block after the cancel
+        future.add_done_callback(_release_shared)
+        raise
+    if (shared is None) or isinstance(shared, DataFrame):
+        return shared
+    return _from_shared(*shared)
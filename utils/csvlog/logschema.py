@@ -0,0 +1,78 @@
+__doc__=""" Sidecar schema of the CSV log files. The recorder writes the
+names and types of its columns next to the log file of the day. The
+readers then parse with exact names and types in one pass. Log files
+without schema are still named by the number of their columns.
+
+The schema is a small JSON file:
+
+{"version": 1, "names": ["TIME", "SMP", ...], "types": ["datetime", "float64", ...]}
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os.path
+import json
+
+from ..typing import(
+    f64, Dict, strings
+)
+from ..common import(
+    SAMPLE_NAMES
+)
+
+SCHEMA_EXT = '.schema'
+SCHEMA_VERSION = 1
+
+""" The types of the columns other than TIME """
+SCHEMA_TYPES = {
+    'float64': f64
+}
+
+
+""" Return the path of the schema file for a CSV log file """
+def _get_schema_name(
+        logname: str
+) -> str:
+    return os.path.splitext(logname)[0] + SCHEMA_EXT
+
+
+""" Return the names and the types of the columns of the log
+file. None if there is no valid schema """
+def _read_schema(
+        logname: str
+) -> (strings, Dict):
+    if logname is None:
+        return None
+
+    schemaname = _get_schema_name(logname)
+    try:
+        with open(schemaname, 'r') as f:
+            schema = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.error(f'Erroneous schema "{schemaname}"')
+        return None
+
+    if schema.get('version') != SCHEMA_VERSION:
+        logger.warning(f'Unknown version of schema "{schemaname}"')
+        return None
+
+    names, types = schema.get('names', []), schema.get('types', [])
+    if ((len(names) == 0) or
+        (len(names) != len(types)) or
+        (names[0] != 'TIME') or
+        (types[0] != 'datetime') or
+        (not set(names) <= set(SAMPLE_NAMES)) or
+        (not set(types[1:]) <= set(SCHEMA_TYPES))):
+        logger.error(f'Invalid schema "{schemaname}"')
+        return None
+
+    return names, {n: SCHEMA_TYPES[t] for n, t in zip(names[1:], types[1:])}
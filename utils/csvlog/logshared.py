@@ -0,0 +1,199 @@
+__doc__=""" Cache of closed log days shared by all processes on the host.
+The samples of a day are kept uncompressed in a numpy file in a cache
+directory, e.g. in shared memory. The name of the file holds the
+logday, the projected columns and the modification time of its log
+file. The server and the scripts map these files instead of parsing or
+decompressing the log again.
+
+The cache is off unless a directory is set. It keeps within a budget.
+The least recently used files are removed first.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import os.path
+import glob
+import hashlib
+import tempfile
+import threading
+
+import numpy as np
+
+from ..typing import(
+    strings
+)
+from pandas import(
+    DataFrame
+)
+
+SHARED_EXT = '.npy'
+SHARED_CLEAN = '.clean'
+
+SHARED_DIR = os.environ.get('SOLAR_CHECKER_SHARED_DIR')
+SHARED_MAX_MB = 256
+
+SHARED_LOCK = threading.Lock()
+
+
+""" Set the cache directory. None disables the shared cache """
+def set_shared_dir(
+        shareddir: str
+) -> None:
+    global SHARED_DIR
+    SHARED_DIR = shareddir
+
+""" Set the budget of the files in the cache directory """
+def set_shared_size(
+        maxmb: float
+) -> None:
+    global SHARED_MAX_MB
+    SHARED_MAX_MB = maxmb
+
+
+""" Return the key of the projected columns in the file name """
+def _get_shared_cols(
+        usecols: strings
+) -> str:
+    if usecols is None:
+        return 'all'
+    return hashlib.sha1(repr(sorted(set(usecols))).encode()).hexdigest()[:8]
+
+
+""" Return the path of the shared file for a logday. Different log
+directories get different sub directories. Cleaned days and each
+projection of the columns have their own files. """
+def _get_shared_name(
+        logday: str,
+        logprefix: str,
+        logdir: str,
+        mtime: int,
+        usecols: strings = None,
+        isclean: bool = False
+) -> str:
+    subdir = hashlib.sha1(
+        os.path.abspath(logdir).encode()
+    ).hexdigest()[:8]
+    kind = SHARED_CLEAN if isclean else ''
+    cols = _get_shared_cols(usecols)
+    return os.path.join(
+        SHARED_DIR, subdir, f'{logprefix}_{logday}{kind}_{cols}_{mtime}{SHARED_EXT}'
+    )
+
+
+""" Read the samples of a logday from the shared cache. Returns None if
+there is no file for the modification time of the log file """
+def _read_shared(
+        logday: str,
+        logprefix: str,
+        logdir: str,
+        mtime: int,
+        usecols: strings = None,
+        isclean: bool = False
+) -> DataFrame:
+    if (SHARED_DIR is None) or (mtime is None):
+        return None
+
+    sharedname = _get_shared_name(logday, logprefix, logdir, mtime, usecols, isclean)
+    try:
+        shared = np.load(sharedname, mmap_mode='r', allow_pickle=False)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.error(f'Erroneous shared data "{sharedname}"')
+        return None
+
+    # The modification time tells the last use
+    try:
+        os.utime(sharedname)
+    except OSError:
+        pass
+
+    logger.info(f'Using shared data "{sharedname}"')
+    return DataFrame({c: shared[0][c] for c in shared.dtype.names})
+
+
+""" Write the projected samples of a logday to the shared cache. Each
+column is a contiguous field of a single record. Files of older
+modification times of the same logday are removed. """
+def _write_shared(
+        logday: str,
+        logprefix: str,
+        logdir: str,
+        mtime: int,
+        samples: DataFrame,
+        usecols: strings = None,
+        isclean: bool = False
+) -> bool:
+    if (SHARED_DIR is None) or (mtime is None):
+        return False
+
+    sharedname = _get_shared_name(logday, logprefix, logdir, mtime, usecols, isclean)
+    shareddir = os.path.dirname(sharedname)
+    nrows = len(samples)
+
+    shared = np.zeros(1, dtype=[
+        (c, samples[c].dtype, (nrows,)) for c in samples.columns
+    ])
+    for c in samples.columns:
+        shared[0][c] = samples[c].to_numpy()
+
+    tempname = None
+    try:
+        os.makedirs(shareddir, exist_ok=True)
+        fd, tempname = tempfile.mkstemp(suffix='.tmp', dir=shareddir)
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, shared, allow_pickle=False)
+        os.chmod(tempname, 0o644)
+        os.replace(tempname, sharedname)
+    except OSError:
+        logger.warning(f'Cannot write shared data "{sharedname}"')
+        if tempname is not None and os.path.isfile(tempname):
+            os.remove(tempname)
+        return False
+
+    kind = SHARED_CLEAN if isclean else ''
+    for stale in glob.glob(
+            os.path.join(shareddir, f'{logprefix}_{logday}{kind}_*_*{SHARED_EXT}')
+    ):
+        if not stale.endswith(f'_{mtime}{SHARED_EXT}'):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+    _prune_shared()
+    return True
+
+
+""" Remove the least recently used files beyond the budget """
+def _prune_shared() -> None:
+    with SHARED_LOCK:
+        entries = []
+        for name in glob.glob(os.path.join(SHARED_DIR, '*', f'*{SHARED_EXT}')):
+            try:
+                st = os.stat(name)
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, name))
+
+        entries.sort()
+        nbytes = sum(size for _, size, _ in entries)
+        maxbytes = SHARED_MAX_MB*1024*1024
+
+        for _, size, name in entries:
+            if nbytes <= maxbytes:
+                break
+            try:
+                os.remove(name)
+            except OSError:
+                continue
+            nbytes -= size
+            logger.info(f'Removed shared data "{name}"')
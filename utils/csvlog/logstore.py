@@ -0,0 +1,107 @@
+__doc__=""" Binary sidecar store for closed log days. Once a day is
+closed its CSV log file never changes again. The parsed samples are
+kept as typed columns in a compressed numpy archive next to the CSV
+file. Loading the archive avoids the CSV and the TIME parsing. The
+cleaned samples of the day have their own store.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import os.path
+import tempfile
+
+import numpy as np
+
+from ..typing import(
+    strings
+)
+from pandas import(
+    DataFrame
+)
+
+STORE_EXT = '.npz'
+STORE_CLEAN = '.clean'
+
+
+""" Return the path of the store file for a CSV log file """
+def _get_store_name(
+        logname: str,
+        isclean: bool = False
+) -> str:
+    kind = STORE_CLEAN if isclean else ''
+    return os.path.splitext(logname)[0] + kind + STORE_EXT
+
+
+""" Return True if the store exists and is not older than the CSV
+log file. The modification time of the log file in nanoseconds may be
+given, e.g. for a day in a month archive """
+def _is_store_valid(
+        logname: str,
+        storename: str,
+        logmtime: int = None
+) -> bool:
+    try:
+        if logmtime is None:
+            logmtime = os.stat(logname).st_mtime_ns
+        return os.stat(storename).st_mtime_ns >= logmtime
+    except OSError:
+        return False
+
+
+""" Read the samples of a closed day from the store. Returns None if
+there is no valid store for the log file. Only the requested columns
+are decompressed. """
+def _read_store(
+        logname: str,
+        storename: str,
+        usecols: strings = None,
+        logmtime: int = None
+) -> DataFrame:
+    if not _is_store_valid(logname, storename, logmtime):
+        return None
+
+    logger.info(f'Reading binary data from store "{storename}"')
+    try:
+        with np.load(storename, allow_pickle=False) as store:
+            samples = DataFrame({c: store[c] for c in store.files
+                                 if (usecols is None) or (c in usecols)})
+    except Exception:
+        logger.error(f'Erroneous binary data store "{storename}"')
+        return None
+
+    return samples
+
+
+""" Write the samples of a closed day to the store. The write is
+atomic. Readers never see a partially written store """
+def _write_store(
+        storename: str,
+        samples: DataFrame
+) -> bool:
+    tempname = None
+
+    logger.info(f'Writing binary data to store "{storename}"')
+    try:
+        fd, tempname = tempfile.mkstemp(
+            suffix='.tmp', dir=os.path.dirname(storename) or '.'
+        )
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(
+                f, **{c: samples[c].to_numpy() for c in samples.columns}
+            )
+        os.replace(tempname, storename)
+    except OSError:
+        logger.warning(f'Cannot write binary data store "{storename}"')
+        if tempname is not None and os.path.isfile(tempname):
+            os.remove(tempname)
+        return False
+
+    return True
@@ -0,0 +1,80 @@
+__doc__=""" Bounded concurrency for the fan-out over days. Each resource
+has its own semaphore. The per day tasks of one request wait for a
+free slot instead of all running at once. Other requests keep their
+share of the default thread pool and of the network.
+
+Resources must not be nested. A task holding a slot of a resource must
+not wait for another slot of the same resource.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import asyncio
+import weakref
+
+from .typing import(
+    Any, List
+)
+
+""" The number of slots of the resources """
+LIMITS = {
+    'disk': 4,  # Reads of log files and stores
+    'http': 4,  # Requests to Brightsky
+    'cpu': os.cpu_count() or 1  # Numerical work per day
+}
+
+""" The semaphores are bound to their event loop. Scripts may run more
+than one loop """
+SEMAPHORES = weakref.WeakKeyDictionary()
+
+
+""" Set the number of slots of a resource. Tasks already waiting keep
+the previous limit """
+def set_limit(
+        resource: str,
+        limit: int
+) -> None:
+    if resource not in LIMITS:
+        logger.warning(f'Unknown resource "{resource}"')
+        return
+    LIMITS[resource] = max(1, int(limit))
+    SEMAPHORES.clear()
+    logger.info(f'Limit of "{resource}" is "{LIMITS[resource]}"')
+
+
+def _get_semaphore(
+        resource: str
+) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphores = SEMAPHORES.setdefault(loop, dict())
+    if resource not in semaphores:
+        semaphores[resource] = asyncio.Semaphore(LIMITS[resource])
+    return semaphores[resource]
+
+
+""" Await the coroutine when a slot of the resource is free """
+async def bounded(
+        resource: str,
+        coro
+) -> Any:
+    async with _get_semaphore(resource):
+        return await coro
+
+
+""" Same as 'asyncio.gather' for coroutines, but only as many of them
+run at the same time as the resource has slots """
+async def gather_bounded(
+        resource: str,
+        coros
+) -> List[Any]:
+    return await asyncio.gather(
+        *[bounded(resource, c) for c in coros]
+    )
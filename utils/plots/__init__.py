@@ -2,28 +2,35 @@ import sys
 
 from ..typing import (
     t64, t64s,
-    f64, f64s
+    f64, f64s, List
 )
 
 from ._get_w_line import _get_w_line
 from ._get_kwh_line import _get_kwh_line
 from ._get_kwh_bar_unified import _get_kwh_bar_unified
+from ._get_kwh_line_compare import _get_kwh_line_compare
 from ._get_blocks import _get_blocks
-
-if sys.version_info >= (3, 9):
-    from asyncio import (
-        to_thread,
-    )
+from .plotcache import (
+    get_cached_plot,
+    set_plot_cache_size,
+    set_plot_cache_dir,
+    set_plot_cache_disk_size,
+    set_plot_cache_days,
+    set_plot_code_version,
+    get_plot_cache_stats
+)
+from .plotpool import (
+    run_plot,
+    set_plot_workers,
+    has_plot_workers
+)
 
 async def get_w_line(time: t64s, smp: f64s,
                      ivp1: f64s, ivp2: f64s, spph: f64s,
                      sbpi: f64s, sbpo: f64s, sbpb: f64s,
                      tphases: t64s = None,
                      tz:str = None):
-    if sys.version_info >= (3, 9):
-        return await to_thread(_get_w_line,**vars())
-    else:
-        return _get_w_line(**vars())
+    return await run_plot(_get_w_line, **vars())
 
     
 async def get_kwh_line(
@@ -34,28 +41,24 @@ async def get_kwh_line(
         tphases: t64s = None,
         time_format: str = '%H:%M',
         tz:str = None):
-    if sys.version_info >= (3, 9): 
-        return await to_thread(_get_kwh_line, **vars())
-    else:
-        return _get_kwh_line(**vars())
+    return await run_plot(_get_kwh_line, **vars())
 
     
 async def get_kwh_bar_unified(
         time: t64s, smeon: f64s, smeoff: f64s, balcony: f64s,
         price: f64, bar_width: f64, time_format:str):
-    if sys.version_info >= (3, 9): 
-        return await to_thread(
-            _get_kwh_bar_unified, **vars())
-    else:
-        return _get_kwh_bar_unified(**vars())
+    return await run_plot(_get_kwh_bar_unified, **vars())
+
+
+async def get_kwh_line_compare(
+        day: f64s, years: List[str], smeon: f64s, panel: f64s,
+        prices: List[f64], logmonth: str, logday: int = None):
+    return await run_plot(_get_kwh_line_compare, **vars())
 
 
 async def get_blocks(time: t64, smp: f64,
                      ivp1: f64, ivp2: f64, spph: f64,
                      sbpi: f64s, sbpo: f64s, sbpb: f64,
                      spp1: f64, spp2: f64, spp3: f64, spp4: f64):
-    if sys.version_info >= (3, 9):
-        return await to_thread(_get_blocks,**vars())
-    else:
-        return _get_blocks(**vars())
+    return await run_plot(_get_blocks, **vars())
 
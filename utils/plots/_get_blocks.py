@@ -5,23 +5,21 @@ logging.basicConfig(
     datefmt='%H:%M:%S',)
 logger = logging.getLogger(__name__)
 
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import matplotlib.patches as mpatches
 
 import numpy as np
 
-import base64
-from io import BytesIO
-
 from datetime import datetime
 
 from ..typing import (
     t64, t64s,
     f64, f64s, Any
 )
+from .plotpool import (
+    get_figure,
+    get_png
+)
 
 XSIZE, YSIZE = 9, 4
 
@@ -32,7 +30,7 @@ def _get_blocks(time: t64, smp: f64,
     __me__ ='_blocks'
     logger.info(f'started')
 
-    fig, ax = plt.subplots(nrows=1,figsize=(XSIZE, YSIZE))
+    fig, ax = get_figure('blocks', (XSIZE, YSIZE))
 
     ax.axis('equal')
     ax.axis('off')
@@ -210,10 +208,7 @@ def _get_blocks(time: t64, smp: f64,
     title += f'\nLast Sample of the Day @ {hm}'
     ax.set_title(title)
     
-    # Save it to a temporary buffer.
-    buf = BytesIO()
-    fig.savefig(buf, format='png')
-    plt.close(fig)
+    png = get_png(fig)
 
     logger.info(f'done')
-    return base64.b64encode(buf.getbuffer()).decode('ascii')
+    return png
@@ -5,23 +5,21 @@ logging.basicConfig(
     datefmt='%H:%M:%S',)
 logger = logging.getLogger(__name__)
 
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import matplotlib.patches as mpatches
 
 import numpy as np
 
-import base64
-from io import BytesIO
-
 from datetime import datetime
 
 from ..typing import (
     t64, t64s,
     f64, f64s, Any
 )
+from .plotpool import (
+    get_figure,
+    get_png
+)
 
 
 XSIZE, YSIZE = 10, 5
@@ -35,7 +33,7 @@ def _get_kwh_bar_unified(
 
     balconyon = balcony[balcony>0] if balcony is not None else None
 
-    fig, ax = plt.subplots(nrows=1,figsize=(XSIZE, YSIZE+1))
+    fig, ax = get_figure('kwh_bar_unified', (XSIZE, YSIZE+1))
 
     ax.clear()
 
@@ -115,10 +113,7 @@ def _get_kwh_bar_unified(
     ax.grid(which='minor', ls=':', lw=1, axis='both')
     ax.minorticks_on()
 
-    # Save it to a temporary buffer.
-    buf = BytesIO()
-    fig.savefig(buf, format='png')
-    plt.close(fig)
+    png = get_png(fig)
 
     logger.info(f'done')
-    return base64.b64encode(buf.getbuffer()).decode('ascii')
+    return png
@@ -5,23 +5,21 @@ logging.basicConfig(
     datefmt='%H:%M:%S',)
 logger = logging.getLogger(__name__)
 
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import matplotlib.patches as mpatches
 
 import numpy as np
 
-import base64
-from io import BytesIO
-
 from datetime import datetime
 
 from ..typing import (
     t64, t64s,
     f64, f64s, Any
 )
+from .plotpool import (
+    get_figure,
+    get_png
+)
 
 TZ='Europe/Berlin'
 XSIZE, YSIZE = 9, 6
@@ -54,7 +52,7 @@ def _get_kwh_line(
     sbebcharge = np.zeros(N) if sbebcharge is None else sbebcharge
     sbebdischarge = np.zeros(N) if sbebdischarge is None else sbebdischarge
     
-    fig, ax = plt.subplots(nrows=1,figsize=(XSIZE, YSIZE))
+    fig, ax = get_figure('kwh_line', (XSIZE, YSIZE))
 
     ax.clear()
 
@@ -234,11 +232,8 @@ def _get_kwh_line(
     ax.grid(which='minor', ls=':', lw=1, axis='both')
     ax.minorticks_on()
 
-    # Save it to a temporary buffer.
-    buf = BytesIO()
-    fig.savefig(buf, format='png')
-    plt.close(fig)
+    png = get_png(fig)
 
     logger.info(f'done')
 
-    return base64.b64encode(buf.getbuffer()).decode('ascii')
+    return png
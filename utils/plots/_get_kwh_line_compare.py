@@ -0,0 +1,62 @@
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import numpy as np
+
+from ..typing import (
+    f64, f64s, List
+)
+from .plotpool import (
+    get_figure,
+    get_png
+)
+
+
+XSIZE, YSIZE = 10, 5
+
+def _get_kwh_line_compare(
+        day: f64s, years: List[str], smeon: f64s, panel: f64s,
+        prices: List[f64], logmonth: str, logday: int = None):
+
+    __me__='_get_kwh_line_compare'
+    logger.info(f'started')
+
+    fig, ax = get_figure('kwh_line_compare', (XSIZE, YSIZE+1))
+
+    ax.clear()
+
+    title = f'# Energy Check {logmonth} #\n'
+    for y, ysmeon, ypanel, price in zip(years, smeon, panel, prices):
+        line, = ax.plot(day, ypanel, marker='o', label=f'BALCONY {y}')
+        ax.plot(day, ysmeon, ls=':', color=line.get_color(), label=f'GRID > {y}')
+
+        if logday is None:
+            title += f' | {y}:{np.nansum(ypanel):.1f}'
+            if price is not None:
+                title += f'~{np.nansum(ypanel)*price:.2f}€'
+        elif not np.isnan(ypanel[logday-1]):
+            title += f' | {y}:{ypanel[logday-1]:.1f}'
+            title += f'/{ysmeon[logday-1]:.1f}kWh'
+
+    if logday is not None:
+        ax.axvline(logday, color='grey', lw=2, alpha=0.5)
+
+    ax.set_title(title.replace('\n | ', '\n'), fontsize='x-large')
+
+    ax.legend(loc="upper right", ncol=2, fontsize='small')
+    ax.set_ylabel('Energy [kWh]')
+    ax.set_xlabel('Day')
+    ax.set_xlim(0.5, day[-1]+0.5)
+    ax.grid(which='major', ls='-', lw=1, axis='y')
+    ax.grid(which='major', ls=':', lw=1, axis='x')
+    ax.grid(which='minor', ls=':', lw=1, axis='both')
+    ax.minorticks_on()
+
+    png = get_png(fig)
+
+    logger.info(f'done')
+    return png
@@ -5,23 +5,21 @@ logging.basicConfig(
     datefmt='%H:%M:%S',)
 logger = logging.getLogger(__name__)
 
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import matplotlib.patches as mpatches
 from matplotlib.dates import date2num
 import numpy as np
 
-import base64
-from io import BytesIO
-
 from datetime import datetime
 
 from ..typing import (
     t64, t64s,
     f64, f64s, Any
 )
+from .plotpool import (
+    get_figure,
+    get_png
+)
 
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
@@ -75,7 +73,7 @@ def _get_w_line(time: t64s, smp: f64s,
     sbpi = np.zeros(N) if sbpi is None else sbpi
         
     issbpion = sbpi>0
-    sbpion = sbpi
+    sbpion = np.zeros_like(sbpi)
     sbpion[issbpion] = sbpi[issbpion]
     sbpion_mean = sbpion.mean()
     sbpion_max = sbpion.max() 
@@ -105,7 +103,7 @@ def _get_w_line(time: t64s, smp: f64s,
     sbpbout_max = sbpbout.max()
 
     
-    fig, ax = plt.subplots(nrows=1,figsize=(XSIZE, YSIZE))
+    fig, ax = get_figure('w_line', (XSIZE, YSIZE))
     
     ax.clear()
 
@@ -263,10 +261,7 @@ def _get_w_line(time: t64s, smp: f64s,
     ax.grid(which='minor', ls=':', lw=1, axis='both')
     ax.minorticks_on()
     
-    # Save it to a temporary buffer.
-    buf = BytesIO()
-    fig.savefig(buf, format='png')
-    plt.close(fig)
+    png = get_png(fig)
 
     logger.info(f'done')
-    return base64.b64encode(buf.getbuffer()).decode('ascii')
+    return png
@@ -0,0 +1,317 @@
+__doc__=""" Cache of the rendered plots. The base64 encoded images are
+keyed by the view and its parameters. They are valid as long as the
+version of their data is the same, e.g. the modification times of the
+log files. Closed days and months never change again.
+
+The recently used images are kept in memory within a budget. The
+images are also kept on disk and survive a restart. A change of the
+version replaces the images of the key in both tiers. The version also
+holds the digest of the plotting code, so a new plot is never served
+from an older image on disk. The disk keeps
+its own budget. Images beyond it or not used for some days are removed,
+the least recently used first.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import os.path
+import sys
+import glob
+import json
+import time
+import asyncio
+import hashlib
+import tempfile
+
+from collections import(
+    OrderedDict
+)
+
+from ..typing import(
+    Any, Dict
+)
+
+PLOT_CACHE_MAX_MB = 64
+PLOT_CACHE_EXT = '.json'
+
+""" The images on disk are private to the user """
+PLOT_CACHE_DIR = os.environ.get(
+    'SOLAR_CHECKER_PLOT_CACHE_DIR',
+    os.path.join(
+        os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+        'solar_checker',
+        'plots'
+    )
+)
+PLOT_CACHE_DISK_MB = 256
+PLOT_CACHE_MAX_DAYS = 30
+
+
+""" Return the digest of the plotting code """
+def _get_code_version() -> str:
+    sha = hashlib.sha1()
+    for name in sorted(glob.glob(os.path.join(os.path.dirname(__file__), '*.py'))):
+        try:
+            with open(name, 'rb') as f:
+                sha.update(f.read())
+        except OSError:
+            continue
+    return sha.hexdigest()[:16]
+
+PLOT_CODE_VERSION = _get_code_version()
+
+
+""" Return the number of bytes of the images """
+def _get_nbytes(images: Any) -> int:
+    if isinstance(images, str):
+        return len(images)
+    return sum(_get_nbytes(i) for i in images if i is not None)
+
+
+class PlotCache:
+
+    def __init__(self, maxmb: float = PLOT_CACHE_MAX_MB):
+        self.entries = OrderedDict()
+        self.maxbytes = int(maxmb*1024*1024)
+        self.nbytes = 0
+        self.hits = 0
+        self.diskhits = 0
+        self.misses = 0
+
+    def get(self, key: str, version: str) -> (bool, Any):
+        entry = self.entries.get(key)
+        if (entry is None) or (entry[0] != version):
+            return False, None
+        self.entries.move_to_end(key)
+        return True, entry[2]
+
+    def put(self, key: str, version: str, images: Any) -> None:
+        if key in self.entries:
+            self.nbytes -= self.entries.pop(key)[1]
+
+        nbytes = _get_nbytes(images)
+        if nbytes > self.maxbytes:
+            return
+
+        self.entries[key] = (version, nbytes, images)
+        self.nbytes += nbytes
+        self._shrink()
+
+    def resize(self, maxmb: float) -> None:
+        self.maxbytes = int(maxmb*1024*1024)
+        self._shrink()
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self.entries),
+            'nbytes': self.nbytes,
+            'maxbytes': self.maxbytes,
+            'hits': self.hits,
+            'diskhits': self.diskhits,
+            'misses': self.misses
+        }
+
+    def _shrink(self) -> None:
+        while self.nbytes > self.maxbytes and self.entries:
+            _, (_, nbytes, _) = self.entries.popitem(last=False)
+            self.nbytes -= nbytes
+
+
+CACHE = PlotCache()
+
+""" Set the memory budget of the cache for the images """
+def set_plot_cache_size(maxmb: float) -> None:
+    CACHE.resize(maxmb)
+
+""" Set the directory of the images on disk. None disables the disk """
+def set_plot_cache_dir(plotdir: str) -> None:
+    global PLOT_CACHE_DIR
+    PLOT_CACHE_DIR = plotdir
+
+""" Set the version of the code the images are made with. It replaces
+the digest of the plotting code, e.g. by one which also covers the
+views """
+def set_plot_code_version(version: str) -> None:
+    global PLOT_CODE_VERSION
+    PLOT_CODE_VERSION = version
+
+""" Set the budget of the images on disk """
+def set_plot_cache_disk_size(maxmb: float) -> None:
+    global PLOT_CACHE_DISK_MB
+    PLOT_CACHE_DISK_MB = maxmb
+
+""" Set the days the images are kept on disk without being used """
+def set_plot_cache_days(maxdays: float) -> None:
+    global PLOT_CACHE_MAX_DAYS
+    PLOT_CACHE_MAX_DAYS = maxdays
+
+""" Return the hit and miss counters of the cache """
+def get_plot_cache_stats() -> Dict:
+    return CACHE.stats()
+
+
+def _get_hash(value: Any) -> str:
+    return hashlib.sha1(repr(value).encode()).hexdigest()[:16]
+
+
+def _get_disk_name(key: str, version: str) -> str:
+    return os.path.join(PLOT_CACHE_DIR, f'{key}_{version}{PLOT_CACHE_EXT}')
+
+
+def _read_disk(key: str, version: str) -> Any:
+    if PLOT_CACHE_DIR is None:
+        return None
+
+    diskname = _get_disk_name(key, version)
+    try:
+        with open(diskname, 'r') as f:
+            images = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.error(f'Erroneous plot cache "{diskname}"')
+        return None
+
+    # The modification time tells the last use
+    try:
+        os.utime(diskname)
+    except OSError:
+        pass
+    return images if isinstance(images, str) else tuple(images)
+
+
+""" Write the images atomically and remove the images of older
+versions of the key """
+def _write_disk(key: str, version: str, images: Any) -> bool:
+    if PLOT_CACHE_DIR is None:
+        return False
+
+    diskname = _get_disk_name(key, version)
+    tempname = None
+    try:
+        os.makedirs(PLOT_CACHE_DIR, mode=0o700, exist_ok=True)
+        fd, tempname = tempfile.mkstemp(suffix='.tmp', dir=PLOT_CACHE_DIR)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(images, f)
+        os.replace(tempname, diskname)
+    except OSError:
+        logger.warning(f'Cannot write plot cache "{diskname}"')
+        if tempname is not None and os.path.isfile(tempname):
+            os.remove(tempname)
+        return False
+
+    for stale in glob.glob(_get_disk_name(key, '*')):
+        if stale != diskname:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+    _prune_disk()
+    return True
+
+
+""" Remove the images not used for too long and then the least recently
+used images beyond the budget """
+def _prune_disk() -> None:
+    entries = []
+    try:
+        with os.scandir(PLOT_CACHE_DIR) as scan:
+            for e in scan:
+                if not e.name.endswith(PLOT_CACHE_EXT):
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, e.path))
+    except OSError:
+        return
+
+    entries.sort()
+    oldest = time.time() - PLOT_CACHE_MAX_DAYS*86400
+    nbytes = sum(size for _, size, _ in entries)
+    maxbytes = PLOT_CACHE_DISK_MB*1024*1024
+
+    removed = 0
+    for mtime, size, path in entries:
+        if (mtime >= oldest) and (nbytes <= maxbytes):
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        nbytes -= size
+        removed += 1
+
+    if removed > 0:
+        logger.info(f'Removed "{removed}" images from the plot cache on disk')
+
+
+""" Return the images from disk or render them """
+async def _get_images(
+        view: str,
+        key: str,
+        version: str,
+        render
+) -> Any:
+    if sys.version_info >= (3, 9):
+        images = await asyncio.to_thread(_read_disk, key, version)
+    else:
+        images = _read_disk(key, version)
+    if images is not None:
+        CACHE.diskhits += 1
+        logger.info(f'Using images of "{view}" from disk')
+        CACHE.put(key, version, images)
+        return images
+
+    CACHE.misses += 1
+    images = await render()
+    if images is None:
+        return None
+
+    CACHE.put(key, version, images)
+    if sys.version_info >= (3, 9):
+        await asyncio.to_thread(_write_disk, key, version, images)
+    else:
+        _write_disk(key, version, images)
+    return images
+
+
+PENDING = dict()
+
+""" Return the images of the view for the parameters. They are rendered
+by awaiting 'render' only if there are none for the version of the
+data. Concurrent requests for the same images share one render. A
+version of None is never cached. """
+async def get_cached_plot(
+        view: str,
+        params: tuple,
+        version: Any,
+        render
+) -> Any:
+    if version is None:
+        return await render()
+
+    key, version = _get_hash((view, params)), _get_hash((PLOT_CODE_VERSION, version))
+
+    ishit, images = CACHE.get(key, version)
+    if ishit:
+        CACHE.hits += 1
+        logger.info(f'Using images of "{view}" from cache')
+        return images
+
+    pending = PENDING.get((key, version))
+    if pending is None:
+        pending = asyncio.ensure_future(_get_images(view, key, version, render))
+        PENDING[(key, version)] = pending
+        pending.add_done_callback(lambda _: PENDING.pop((key, version), None))
+    return await asyncio.shield(pending)
@@ -0,0 +1,123 @@
+__doc__=""" Renders the plots with the object oriented API of matplotlib.
+The figures are not registered with pyplot, so there is no global state
+shared between concurrent renders. Each thread keeps one figure with its
+Agg canvas per plot as a template and reuses it for the next render.
+
+Rendering holds the GIL. The optional process pool renders the plots on
+all cores. Without it the plots are rendered in threads.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import sys
+import base64
+import asyncio
+import threading
+
+from io import BytesIO
+from functools import partial
+
+from multiprocessing import(
+    get_context
+)
+from concurrent.futures import(
+    ProcessPoolExecutor
+)
+
+from matplotlib.figure import(
+    Figure
+)
+from matplotlib.axes import(
+    Axes
+)
+from matplotlib.backends.backend_agg import(
+    FigureCanvasAgg
+)
+
+from ..typing import(
+    Any
+)
+
+PLOTPOOL = None
+
+TEMPLATES = threading.local()
+
+
+""" Start the pool with the number of workers. Zero workers stops the
+pool. The plots are then rendered in threads again. """
+def set_plot_workers(
+        workers: int
+) -> None:
+    global PLOTPOOL
+
+    if PLOTPOOL is not None:
+        PLOTPOOL.shutdown(wait=False)
+        PLOTPOOL = None
+
+    workers = min(workers, os.cpu_count() or 1)
+    if workers > 0:
+        logger.info(f'Rendering plots with "{workers}" worker processes')
+        PLOTPOOL = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context('spawn')
+        )
+
+def has_plot_workers() -> bool:
+    return PLOTPOOL is not None
+
+
+""" Return the empty figure of the plot with one axes. The figure is
+created with its canvas on first use in the thread. It is cleared in
+case an earlier render failed before get_png """
+def get_figure(
+        name: str,
+        figsize: tuple
+) -> (Figure, Axes):
+    figures = getattr(TEMPLATES, 'figures', None)
+    if figures is None:
+        figures = TEMPLATES.figures = dict()
+
+    fig = figures.get(name)
+    if fig is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        figures[name] = fig
+
+    fig.clear()
+    return fig, fig.add_subplot()
+
+
+""" Return the figure as base64 encoded PNG. The figure is cleared
+for the next render """
+def get_png(
+        fig: Figure
+) -> str:
+    buf = BytesIO()
+    try:
+        fig.savefig(buf, format='png')
+    finally:
+        fig.clear()
+    return base64.b64encode(buf.getbuffer()).decode('ascii')
+
+
+""" Render the plot in a worker process if there is the pool or in a
+thread otherwise """
+async def run_plot(
+        f,
+        **kwargs
+) -> Any:
+    if PLOTPOOL is not None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(PLOTPOOL, partial(f, **kwargs))
+
+    if sys.version_info >= (3, 9):
+        return await asyncio.to_thread(f, **kwargs)
+    return f(**kwargs)
@@ -31,7 +31,8 @@ from ..common import (
     t64_from_iso,
     ymd_tomorrow,
     ymd_yesterday,
-    ymd_over_t64
+    ymd_over_t64,
+    ymd_over_t64s
     )
 from ..common import (
     PARTITION_NAMES
@@ -210,7 +211,7 @@ async def partition_closest_watts(
     todaydfs = [logsdf.loc[day].copy().set_index("TIME") for day in todaydays]
     """ Map the predicted samples to the today times """
     for df in todaydfs:
-        df.index = [ymd_over_t64(t, today) for t in df.index]
+        df.index = ymd_over_t64s(df.index, today)
     """ Use the average of the days for the prediction """
     todaywatts = (reduce(
         lambda x,y: x+y,
@@ -221,7 +222,7 @@ async def partition_closest_watts(
     """ The predicted watts for tomorrow 24h in a single index df"""
     tomorrowdfs = [logsdf.loc[day].copy().set_index("TIME") for day in tomorrowdays]
     for df in tomorrowdfs:
-        df.index = [ymd_over_t64(t, tomorrow) for t in df.index]
+        df.index = ymd_over_t64s(df.index, tomorrow)
     tomorrowwatts = (reduce(
         lambda x,y: x+y,
         [tdf for tdf in tomorrowdfs]
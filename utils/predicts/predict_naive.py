@@ -36,7 +36,11 @@ from ..common import(
     PARTITION_2_VIEW
 )
 from ..csvlog import(
-    get_tunnel_logs
+    get_tunnel_logs,
+    QUALITY_FILLED
+)
+from ..limits import(
+    gather_bounded
 )
 from brightsky import (
     Sky
@@ -104,15 +108,11 @@ async def get_sky_info_24h(
         tz: str = SKY_TZ
 )  -> (List[pd.Dataframe], f64s, f64s, f64s):
 
-    skytasks = [
-        asyncio.create_task(
-            get_sky_pool_24h(
-                cd, lat, lon, tz
-            )
-        ) for cd in castdays]
-    
     """ Get the list of associated columns """
-    skys = await asyncio.gather(*skytasks)
+    skys = await gather_bounded('http', [
+        get_sky_pool_24h(
+            cd, lat, lon, tz
+        ) for cd in castdays])
     if skys is None:
         logger.warning(f'Unable to retrieve sky pools! Returning defaults')
         return 24*[100], 24*[100], 24*[100] 
@@ -178,51 +178,23 @@ async def get_sky_info_24h(
             castdaycover.astype(f64))
 
 
-"""
-Fix the sample inconsistencies if the Solix is off (beloe zero
-celsius). There still may be irridiance though. Then the sum of the
-inverters IVP1, IVP2 is larger than SBPI (should be zero)
-"""
-async def fix_sbpi_lazy(
+""" Resample a cleaned log from minutes to hours. Hours without any
+measured minute are empty. Empty hours at the start and the end are
+dropped like hours without samples. """
+def _get_hour_log(
         log: pd.DataFrame
-):
-    if not (
-        ("SBPI" in log) and
-        ("SBPB" in log) and
-        (("IVP1" in log) or ("IVP2" in log))
-    ):
-        return # log not modified
-    
-    sbpi = log["SBPI"]
-    sbpb = log["SBPB"]
-    ivp = log["IVP1"] + log["IVP2"]
-    isivpoversbpi = (ivp > sbpi) & ~(sbpb >0)
-    sbpi[isivpoversbpi] = ivp[isivpoversbpi]
+) -> pd.DataFrame:
+    log = log.set_index('TIME')
+    isfilled = (log.pop('QUALITY').astype(np.int64) & QUALITY_FILLED) > 0
 
-    
-"""
-Fix the inconsistencies if the Solix is not off but only returning
-frozen values. The inverter values may still be good though. Then they
-override the SBPI values.
-"""
-async def fix_sbpi_frozen(
-        log: pd.DataFrame
-):
-    if not (
-        ("SBPI" in log) and
-        (("IVP1" in log) or ("IVP2" in log))
-    ):
-        return # log not modified
+    hours = log.resample('h', label='left', closed='left').mean()
+    isempty = isfilled.resample('h', label='left', closed='left').min() > 0
+    hours[isempty.to_numpy()] = np.nan
 
-    ivp1 = log["IVP1"]
-    ivp2 = log["IVP2"]
-    sbpi = log["SBPI"]
-    issbpion = sbpi>0
-    sbpidiff = sbpi[issbpion].diff()
-    sbpifreeze = sbpidiff[sbpidiff==0]
-    if not sbpifreeze.all():
-        logger.info("Solix has frozen: Replace all SBPI by IVP")
-        sbpi[issbpion] = ivp1[issbpion] +ivp2[issbpion]
+    measured = hours.index[~isempty.to_numpy()]
+    if len(measured) == 0:
+        return hours.iloc[:0]
+    return hours.loc[measured[0]:measured[-1]]
 
 
 LOGTUNNELSIZE = 3
@@ -233,31 +205,25 @@ async def get_sample_logs_24h(
         logwindow: int = LOGTUNNELSIZE
 ) -> (List, List[pd.DataFrame], pd.DataFrame, pd.DataFrame):
 
-    # Get the logs close to the forecast day
+    # Get the logs close to the forecast day. The SBPI samples are
+    # already fixed by the cleaning.
     logdays, logs = await get_tunnel_logs(
         logwindow = logwindow,
         logprefix = logprefix,
         logdir = logdir,
-        usecols = POWER_NAMES[:-4] # Skip plugs!
+        usecols = POWER_NAMES[:-4] + ['QUALITY'], # Skip plugs!
+        isclean = True
     )
 
     logger.info(f'Cast initially based on "{len(logdays)}" days.')
 
     # Reample logs from minutes to hour resolution
-    logs = [
-        l.set_index('TIME').resample(
-            'h', label='left', closed='left'
-        ).mean() for l in logs
-    ]
+    logs = [_get_hour_log(l) for l in logs]
 
     # The day for the forcast is at the end of the list
     castday = logdays[-1]
     castdaylog = logs[-1]
 
-    # Fix castdaylog
-    await fix_sbpi_frozen(castdaylog) 
-    await fix_sbpi_lazy(castdaylog)
-
     tunnellogs = None
     tunneldaylog = None
     if len(logs) > 1:
@@ -285,12 +251,6 @@ async def get_sample_logs_24h(
         
         logger.info(f'"{len(tunnellogs)}" tunnel days left after sun check.')
 
-        # Get rid of frozrn SBPI samples
-        for l in tunnellogs:
-            await fix_sbpi_frozen(l) 
-            await fix_sbpi_lazy(l)
-
-        
         # Make the  single log from the many passed logs
     
         _tunnellogs = pd.concat(
@@ -304,8 +264,6 @@ async def get_sample_logs_24h(
             freq="h"
         ).set_names('TIME')
 
-        await fix_sbpi_lazy(tunneldaylog)
-
         # Fix logdays
         logdays = [
             l.index[0].strftime(LOGDAYFORMAT) for l in tunnellogs
@@ -1,3 +1,8 @@
 from .get_columns_from_csv import get_columns_from_csv
 from .get_kwh_sum_month_unified import get_kwh_sum_month_unified
 from .get_kwh_sum_year_unified import get_kwh_sum_year_unified
+from .get_kwh_sum_days import get_kwh_sum_days
+from .get_slot_stats import get_slot_stats
+from .get_load_percentiles import get_load_percentiles, update_load_percentiles
+from .get_kwh_sum_compare import get_kwh_sum_compare
+from .get_downsampled import get_downsampled, DOWNSAMPLE_METHODS
@@ -1,4 +1,10 @@
-__doc__="""
+__doc__=""" Columns of the power samples of a logday as numpy arrays.
+
+The columns of a day are read-only views into one contiguous array.
+Missing columns share a single read-only buffer of zeros. The columns
+are made once per dataframe. The dataframes of closed days come from
+the cache, so repeated calls for the same day do not allocate. Callers
+must copy a column before changing it.
 """
 __version__ = "0.0.0"
 __author__ = "r09491@gmail.com"
@@ -12,44 +18,93 @@ logger = logging.getLogger(__name__)
 
 import sys
 import asyncio
+import weakref
 
 import numpy as np
 
 from ..typing import(
     f64, f64s, t64, t64s, strings
 )
-
+from ..common import(
+    POWER_NAMES
+)
 from ..csvlog import(
     get_power_log
 )
+from pandas import(
+    DataFrame
+)
+
+
+""" The columns of the dataframes still alive by their id """
+COLUMNS = dict()
+
+ZEROS = np.zeros(0, dtype=f64)
+
+""" Return a read-only view of zeros. The buffer only grows """
+def _get_zeros(
+        nrows: int
+) -> f64s:
+    global ZEROS
+    if ZEROS.size < nrows:
+        ZEROS = np.zeros(max(nrows, 24*60), dtype=f64)
+        ZEROS.flags.writeable = False
+    return ZEROS[:nrows]
+
+
+""" Copy the power columns of the dataframe into one contiguous array
+and return read-only views of its rows """
+def _to_columns(
+        df: DataFrame
+) -> dict:
+    nrows = df.shape[0]
+    names = [n for n in POWER_NAMES[1:] if n in df]
+
+    block = np.empty((len(names), nrows), dtype=f64)
+    for i, n in enumerate(names):
+        block[i] = df[n].to_numpy()
+    block.flags.writeable = False
+
+    time = None
+    if 'TIME' in df:
+        time = df['TIME'].to_numpy().view()
+        time.flags.writeable = False
+
+    columns = dict(zip(names, block))
+    return {n: (time if n == 'TIME' else
+                columns[n] if n in columns else _get_zeros(nrows))
+            for n in POWER_NAMES}
+
+
+""" Return the columns of the dataframe. They are made only once for
+each dataframe. """
+def _get_columns(
+        df: DataFrame
+) -> dict:
+    key = id(df)
+    ref, columns = COLUMNS.get(key, (None, None))
+    if (ref is None) or (ref() is not df):
+        columns = _to_columns(df)
+        COLUMNS[key] = (weakref.ref(df), columns)
+        weakref.finalize(df, COLUMNS.pop, key, None)
+
+    # Callers may change the dict but not the columns
+    return dict(columns)
+
 
 async def get_columns_from_csv(
         logday: str = None,
         logprefix: str = None,
         logdir: str = None) -> dict:
-        
+
     df = await get_power_log(
         logday=logday,
         logprefix=logprefix,
         logdir=logdir
     )
-    
+
     if df is None:
         logger.error(f'Undefined or erroneous LOG file for "{logday}"')
         return None
-    
-    return {
-        "TIME": df["TIME"].to_numpy() if "TIME" in df else None,
-        "SMP" : df["SMP"].to_numpy() if "SMP" in df else np.zeros(df.shape[0]),
-        "IVP1": df["IVP1"].to_numpy() if "IVP1" in df else np.zeros(df.shape[0]),
-        "IVP2": df["IVP2"].to_numpy() if "IVP2" in df else np.zeros(df.shape[0]),
-        "SPPH": df["SPPH"].to_numpy() if "SPPH" in df else np.zeros(df.shape[0]),
-        "SBPI": df["SBPI"].to_numpy() if "SBPI" in df else np.zeros(df.shape[0]),
-        "SBPO": df["SBPO"].to_numpy() if "SBPO" in df else np.zeros(df.shape[0]),
-        "SBPB": df["SBPB"].to_numpy() if "SBPB" in df else np.zeros(df.shape[0]),
-        "SBSB" :df["SBSB"].to_numpy() if "SBSB" in df else np.zeros(df.shape[0]),
-        "SPP1" :df["SPP1"].to_numpy() if "SPP1" in df else np.zeros(df.shape[0]),
-        "SPP2" :df["SPP2"].to_numpy() if "SPP2" in df else np.zeros(df.shape[0]),
-        "SPP3" :df["SPP3"].to_numpy() if "SPP3" in df else np.zeros(df.shape[0]),
-        "SPP4" :df["SPP4"].to_numpy() if "SPP4" in df else np.zeros(df.shape[0])
-    }
+
+    return _get_columns(df)
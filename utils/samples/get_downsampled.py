@@ -0,0 +1,159 @@
+__doc__=""" Downsampling of the sample series for the charts in the
+browser. The shape of the series is preserved. 'lttb' keeps the point
+with the largest triangle in each bucket (Largest Triangle Three
+Buckets). 'minmax' keeps the minimum and the maximum of each bucket, so
+no peak gets lost. Series with up to the requested number of points are
+kept as they are.
+
+The samples are logged in local wall-clock time. With a time zone the
+times are localized before they are converted to milliseconds since
+the epoch, so the browser shows them at the right hour across DST.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import sys
+import asyncio
+
+import numpy as np
+
+from ..typing import(
+    f64, f64s, t64s, strings
+)
+from pandas import(
+    DatetimeIndex
+)
+
+DOWNSAMPLE_METHODS = ['lttb', 'minmax']
+
+
+""" Return the indices of the points kept by LTTB. The first and the
+last point are always kept. """
+def _get_lttb(
+        x: f64s,
+        y: f64s,
+        points: int
+) -> np.ndarray:
+    n = y.size
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    y = np.nan_to_num(y)
+
+    every = (n - 2) / (points - 2)
+    edges = np.append((np.arange(points - 1)*every).astype(np.int64) + 1, n)
+
+    indices = np.empty(points, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(points - 2):
+        lo, hi, nhi = edges[i], edges[i+1], edges[i+2]
+        cx, cy = x[hi:nhi].mean(), y[hi:nhi].mean()
+        areas = np.abs((x[a] - cx)*(y[lo:hi] - y[a]) - (x[a] - x[lo:hi])*(cy - y[a]))
+        a = lo + int(np.argmax(areas))
+        indices[i+1] = a
+
+    return indices
+
+
+""" Return the indices of the minimum and the maximum in each bucket in
+their order """
+def _get_minmax(
+        y: f64s,
+        points: int
+) -> np.ndarray:
+    n = y.size
+    if points >= n or points < 2:
+        return np.arange(n)
+
+    y = np.nan_to_num(y)
+
+    edges = np.linspace(0, n, points//2 + 1).astype(np.int64)
+
+    indices = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi <= lo:
+            continue
+        imin, imax = lo + np.argmin(y[lo:hi]), lo + np.argmax(y[lo:hi])
+        indices.extend(sorted({imin, imax}))
+
+    return np.array(indices, dtype=np.int64)
+
+
+""" Return the times in milliseconds since the epoch and the mask of
+the valid times. Naive times are localized in the time zone. Times
+repeated when the clock is set back are resolved by their order, else
+they are invalid. Skipped times are shifted forward. """
+def _get_epoch_ms(
+        time: t64s,
+        tz: str = None
+) -> (np.ndarray, np.ndarray):
+    index = DatetimeIndex(time)
+    if (tz is not None) and (index.tz is None):
+        try:
+            index = index.tz_localize(
+                tz, ambiguous='infer', nonexistent='shift_forward')
+        except ValueError:
+            index = index.tz_localize(
+                tz, ambiguous='NaT', nonexistent='shift_forward')
+    valid = ~index.isna()
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    ms = index.values.astype('datetime64[ms]').astype(np.int64)
+    return ms, valid
+
+
+def _get_downsampled(
+        time: t64s,
+        columns: dict,
+        points: int,
+        method: str,
+        tz: str = None
+) -> dict:
+    ms, valid = _get_epoch_ms(time, tz)
+    ms = ms[valid]
+    x = ms.astype(f64)
+
+    series = dict()
+    for name, values in columns.items():
+        if values is None:
+            continue
+        values = np.asarray(values, dtype=f64)[valid]
+        if method == 'lttb':
+            indices = _get_lttb(x, values, points)
+        else:
+            indices = _get_minmax(values, points)
+        series[name] = (ms[indices], values[indices])
+
+    return series
+
+
+""" Return the downsampled series of the columns as pairs of the times
+in milliseconds since the epoch and the values. Naive times are local
+in the time zone if given. Each column keeps its own points. Missing
+columns are skipped. Returns None for an unknown method. """
+async def get_downsampled(
+        time: t64s,
+        columns: dict,
+        points: int,
+        method: str = 'lttb',
+        tz: str = None
+) -> dict:
+
+    if method not in DOWNSAMPLE_METHODS:
+        logger.error(f'Unknown downsample method "{method}"')
+        return None
+
+    if sys.version_info >= (3, 9):
+        return await asyncio.to_thread(
+            _get_downsampled, time, columns, points, method, tz
+        )
+    return _get_downsampled(time, columns, points, method, tz)
@@ -0,0 +1,94 @@
+__doc__=""" Compares the energy of the days of a month over all recorded
+years. The unified energy results of the days of all years are taken
+from the persistent table of daily sums in one go. The panel energy is
+unified with the same priorities as for the month. """
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import asyncio
+
+from datetime import datetime
+
+import numpy as np
+
+from ..typing import(
+    f64
+)
+from ..csvlog import(
+    get_logdays
+)
+
+from .get_kwh_sum_days import get_kwh_sum_days
+
+MONTHDAYS = 31
+
+
+""" Return the logdays of the month in the year. Days which do not
+exist in the month are None """
+def _get_month_logdays(
+        year: int,
+        month: int,
+        logdayformat: str
+) -> list:
+    logdays = []
+    for d in range(1, MONTHDAYS + 1):
+        try:
+            logdays.append(datetime(year, month, d).strftime(logdayformat))
+        except ValueError:
+            logdays.append(None)
+    return logdays
+
+
+async def get_kwh_sum_compare(
+        logmonth: str,
+        logprefix: str,
+        logdir: str,
+        logdayformat: str) -> dict:
+
+    __me__='get_kwh_sum_compare'
+    logger.info(f'{__me__}: started "{logmonth}"')
+
+    month = datetime.strptime(logmonth, logdayformat[:-2]).month
+
+    years = sorted({
+        datetime.strptime(ld, logdayformat).year
+        for ld in await get_logdays(logprefix, logdir, '*')
+        if datetime.strptime(ld, logdayformat).month == month
+    })
+    if len(years) == 0:
+        logger.info(f'{__me__}: aborted')
+        return None
+
+    """ All days of the month in all years at once """
+
+    ylogdays = [_get_month_logdays(y, month, logdayformat) for y in years]
+    logdays = [ld for lds in ylogdays for ld in lds if ld is not None]
+    results = dict(zip(logdays, await get_kwh_sum_days(logdays, logprefix, logdir)))
+
+    ysmeon = np.full((len(years), MONTHDAYS), np.nan, dtype=f64)
+    ysmeoff = np.full((len(years), MONTHDAYS), np.nan, dtype=f64)
+    ypanel = np.full((len(years), MONTHDAYS), np.nan, dtype=f64)
+
+    for y, lds in enumerate(ylogdays):
+        for d, ld in enumerate(lds):
+            r = results.get(ld)
+            if r is None: continue
+            smeon, smeoff, ive1, ive2, speh, sbeo = r
+
+            # 1.Prio smartplug, 2.Prio inverter, 3.Prio solarbank
+            panel = speh if speh > 0 else ive1 + ive2
+            panel = panel if panel > 0 else sbeo
+
+            ysmeon[y, d], ysmeoff[y, d], ypanel[y, d] = smeon, smeoff, panel
+
+    logger.info(f'{__me__}: done')
+    return {'DAY': np.arange(1, MONTHDAYS + 1),
+            'YEARS': [datetime(y, month, 1).strftime(logdayformat[:2]) for y in years],
+            'SMEON': ysmeon, 'SMEOFF': ysmeoff, 'PANEL': ypanel}
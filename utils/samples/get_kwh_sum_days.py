@@ -0,0 +1,209 @@
+__doc__=""" Persistent table with the energy sums of each logday. The
+sums of a day are calculated once from its log file and kept in a
+compressed numpy archive in the log directory. The row of a day is
+calculated again only if the modification time of its log file
+changes. This is the case for today.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import os.path
+import sys
+import asyncio
+import fcntl
+import tempfile
+import threading
+
+import numpy as np
+
+from ..typing import(
+    f64, List, strings
+)
+from ..common import(
+    ymd_today
+)
+from ..limits import(
+    gather_bounded
+)
+from ..csvlog.csvlog import(
+    _get_logmtime
+)
+
+from .get_kwh_sum_from_csv import get_kwh_sum_from_csv
+
+KWH_NAMES = ['SMEON', 'SMEOFF', 'IVE1', 'IVE2', 'SPEH', 'SBEO']
+
+KWH_EXT = '_kwh.npz'
+
+
+class KwhTable:
+
+    def __init__(self, logprefix: str, logdir: str):
+        self.name = os.path.join(logdir, f'{logprefix}{KWH_EXT}')
+        self.lockname = self.name + '.lock'
+        self.lock = threading.Lock()
+        self.rows = dict()
+        self.mtime = None
+        self.dirty = False
+
+    """ Read the table again if the file changed since it was read
+    last, e.g. by another process. Rows not yet saved are kept unless
+    the file has a row for a newer log file """
+    def _load(self) -> None:
+        try:
+            mtime = os.stat(self.name).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if mtime == self.mtime:
+            return
+        self.mtime = mtime
+        if mtime is None:
+            return
+
+        logger.info(f'Reading energy sums from "{self.name}"')
+        try:
+            with np.load(self.name, allow_pickle=False) as store:
+                logdays = store['LOGDAY']
+                mtimes = store['MTIME']
+                sums = np.stack([store[n] for n in KWH_NAMES], axis=1)
+        except Exception:
+            logger.error(f'Erroneous energy sums "{self.name}"')
+            return
+
+        for ld, mt, s in zip(logdays.tolist(), mtimes.tolist(), sums.tolist()):
+            row = self.rows.get(ld)
+            if (row is None) or (row[0] <= mt):
+                self.rows[ld] = (mt, tuple(s))
+
+    """ Return the sums of the logday if still valid for the
+    modification time of its log file """
+    def get(self, logday: str, mtime: int) -> tuple:
+        with self.lock:
+            self._load()
+            row = self.rows.get(logday)
+        if (row is None) or (row[0] != mtime):
+            return None
+        return row[1]
+
+    """ Set the sums of the logday. Only sums of closed days make the
+    table to be saved """
+    def put(self, logday: str, mtime: int, sums: tuple, isclosed: bool) -> None:
+        with self.lock:
+            self._load()
+            self.rows[logday] = (mtime, tuple(sums))
+            self.dirty |= isclosed
+
+    """ Save the table if days were closed since the last save. The
+    rows saved by other processes meanwhile are merged. The file lock
+    serializes the writers of different processes. The write is
+    atomic """
+    def save(self) -> bool:
+        with self.lock:
+            if not self.dirty:
+                return True
+
+            tempname = None
+            logger.info(f'Writing energy sums to "{self.name}"')
+            try:
+                fd = os.open(self.lockname, os.O_RDWR | os.O_CREAT, 0o644)
+                with os.fdopen(fd, 'r+b') as l:
+                    fcntl.flock(l, fcntl.LOCK_EX)
+                    self._load()
+
+                    logdays = sorted(self.rows)
+                    mtimes = np.array(
+                        [self.rows[ld][0] for ld in logdays], dtype=np.int64
+                    )
+                    sums = np.array(
+                        [self.rows[ld][1] for ld in logdays], dtype=f64
+                    ).reshape(len(logdays), len(KWH_NAMES))
+
+                    fd, tempname = tempfile.mkstemp(
+                        suffix='.tmp', dir=os.path.dirname(self.name) or '.'
+                    )
+                    with os.fdopen(fd, 'wb') as f:
+                        np.savez_compressed(
+                            f,
+                            LOGDAY=np.array(logdays, dtype=str),
+                            MTIME=mtimes,
+                            **{n: sums[:,i] for i, n in enumerate(KWH_NAMES)}
+                        )
+                    os.replace(tempname, self.name)
+                    self.mtime = os.stat(self.name).st_mtime_ns
+                    self.dirty = False
+            except OSError:
+                logger.warning(f'Cannot write energy sums "{self.name}"')
+                if tempname is not None and os.path.isfile(tempname):
+                    os.remove(tempname)
+                return False
+
+        return True
+
+
+TABLES = dict()
+TABLES_LOCK = threading.Lock()
+
+""" Return the table for the log files with prefix in the directory """
+def _get_kwh_table(
+        logprefix: str,
+        logdir: str
+) -> KwhTable:
+    key = (logdir, logprefix)
+    with TABLES_LOCK:
+        if key not in TABLES:
+            TABLES[key] = KwhTable(logprefix, logdir)
+        return TABLES[key]
+
+
+""" Return the energy sums for each of the logdays in the order of
+KWH_NAMES. The item is None for a logday without log file """
+async def get_kwh_sum_days(
+        logdays: strings,
+        logprefix: str,
+        logdir: str) -> List[tuple]:
+
+    __me__='get_kwh_sum_days'
+    logger.info(f'{__me__}: started "{len(logdays)}" days')
+
+    table = _get_kwh_table(logprefix, logdir)
+    mtimes = [_get_logmtime(ld, logprefix, logdir) for ld in logdays]
+
+    if sys.version_info >= (3, 9):
+        results = await asyncio.to_thread(
+            lambda: [None if mt is None else table.get(ld, mt)
+                     for ld, mt in zip(logdays, mtimes)]
+        )
+    else:
+        results = [None if mt is None else table.get(ld, mt)
+                   for ld, mt in zip(logdays, mtimes)]
+
+    """ Calculate the missing rows from the log files """
+
+    missing = [i for i, (r, mt) in enumerate(zip(results, mtimes))
+               if (r is None) and (mt is not None)]
+    sums = await gather_bounded('disk', [
+        get_kwh_sum_from_csv(logdays[i], logprefix, logdir) for i in missing
+    ])
+
+    today = ymd_today()
+    for i, s in zip(missing, sums):
+        if s is None: continue
+        results[i] = tuple(s[n] for n in KWH_NAMES)
+        table.put(logdays[i], mtimes[i], results[i], logdays[i] < today)
+
+    if sys.version_info >= (3, 9):
+        await asyncio.to_thread(table.save)
+    else:
+        table.save()
+
+    logger.info(f'{__me__}: done')
+    return results
@@ -22,7 +22,7 @@ from ..typing import(
     f64, t64
 )
 
-from .get_kwh_sum_from_csv import get_kwh_sum_from_csv
+from .get_kwh_sum_days import get_kwh_sum_days
 
 async def get_kwh_sum_month(logmonth: str,
                             logprefix: str,
@@ -39,13 +39,8 @@ async def get_kwh_sum_month(logmonth: str,
                         month=dt.month%12+1, day=1), 'D')                               
     mtime = np.arange(first, last, dtype=t64)
 
-    async def doer(t: t64) -> dict:
-        md = t.astype(datetime).strftime(logdayformat)
-        ms = await get_kwh_sum_from_csv(md, logprefix, logdir)
-        if ms is None: return None
-        return ms.values()
-    doertasks = [asyncio.create_task(doer(t)) for t in mtime]
-    results = await asyncio.gather(*doertasks)
+    mdays = [t.astype(datetime).strftime(logdayformat) for t in mtime]
+    results = await get_kwh_sum_days(mdays, logprefix, logdir)
 
     """ Initialise the samples for the month """
     
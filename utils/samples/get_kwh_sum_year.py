@@ -22,6 +22,9 @@ import numpy as np
 from ..typing import(
     f64, t64
 )
+
+from .get_kwh_sum_month import get_kwh_sum_month
+
 async def get_kwh_sum_year(
         logyear: str,
         logprefix: str,
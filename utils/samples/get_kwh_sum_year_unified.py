@@ -19,6 +19,9 @@ import numpy as np
 from ..typing import(
     f64, t64
 )
+from ..limits import(
+    gather_bounded
+)
 
 from .get_kwh_sum_month_unified import get_kwh_sum_month_unified
 
@@ -43,7 +46,7 @@ async def get_kwh_sum_year_unified(
         if ys is None: return None
         yss = [v.sum() for v in list(ys.values())[1:]]
         return yss
-    results = await asyncio.gather(*[doer(t) for t in ytime])
+    results = await gather_bounded('cpu', [doer(t) for t in ytime])
 
     ysmeon = np.zeros(ytime.size, dtype=f64)
     ysmeoff = np.zeros(ytime.size, dtype=f64)
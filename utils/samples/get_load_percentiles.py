@@ -0,0 +1,370 @@
+__doc__=""" Persistent cube with the percentiles of the load profile. For
+each month and weekday the percentiles of SMP, SBPI and SBPB are kept
+for each minute of the day. An extra month and an extra weekday hold
+the percentiles over all months and all weekdays.
+
+The cube is kept in a numpy archive in the log directory. Only the
+groups of the closed days which are new or changed since the last
+update are calculated again. The groups over all months or weekdays
+span the whole history. They are only marked as changed and calculated
+again when they are read. The samples come from the minute archive.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import os
+import os.path
+import sys
+import asyncio
+import tempfile
+import threading
+
+from datetime import datetime
+
+import numpy as np
+
+from ..typing import(
+    f32, f64, List, strings
+)
+from ..common import(
+    ymd_today
+)
+from ..csvlog import(
+    get_logdays,
+    get_logmtimes,
+    get_archive_logs
+)
+from ..csvlog.logarchive import(
+    ARCHIVE_NAMES,
+    MINUTES
+)
+from pandas import(
+    Series
+)
+
+PERCENTILE_NAMES = ['SMP', 'SBPI', 'SBPB']
+PERCENTILES = [5, 10, 25, 50, 75, 90, 95]
+
+""" The extra month and weekday for all months and weekdays """
+ALL_MONTHS = 12
+ALL_WEEKDAYS = 7
+
+PERCENTILE_EXT = '_percentiles.npz'
+
+
+""" Return the month and the weekday of the logday from zero """
+def _get_group(
+        logday: str
+) -> (int, int):
+    day = datetime.strptime(logday, '%y%m%d')
+    return day.month - 1, day.weekday()
+
+
+""" Return the minute of the day of 'HH:MM' """
+def _get_minute(
+        hm: str
+) -> int:
+    hours, minutes = hm.split(':')
+    return int(hours)*60 + int(minutes)
+
+
+""" Return the percentiles of the days for each minute and column with
+linear interpolation. Missing samples are skipped. The days are sorted
+once for all percentiles. """
+def _get_percentiles(
+        grids: np.ndarray
+) -> np.ndarray:
+    ordered = np.sort(grids, axis=0)
+    counts = (~np.isnan(grids)).sum(axis=0)
+
+    positions = (np.array(PERCENTILES, dtype=f64)/100)[:,None,None]*np.maximum(counts - 1, 0)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    low = np.take_along_axis(ordered, lower, axis=0).astype(f64)
+    high = np.take_along_axis(ordered, upper, axis=0).astype(f64)
+
+    percentiles = low + (high - low)*(positions - lower)
+    percentiles[:, counts == 0] = np.nan
+    return np.moveaxis(percentiles, 0, -1).astype(f32)
+
+
+""" Return the percentile values of the days for the groups """
+def _get_values(
+        days: strings,
+        grids: np.ndarray
+) -> (np.ndarray, np.ndarray):
+    values = grids[:, :, [ARCHIVE_NAMES.index(n) for n in PERCENTILE_NAMES]]
+    groups = np.array([_get_group(ld) for ld in days], dtype=np.int64).reshape(-1, 2)
+    return values, groups
+
+
+class PercentileCube:
+
+    def __init__(self, logprefix: str, logdir: str):
+        self.name = os.path.join(logdir, f'{logprefix}{PERCENTILE_EXT}')
+        self.lock = threading.Lock()
+        self.cube = None
+        self.days = None
+        self.dirty = None
+
+    def _reset(self) -> None:
+        self.cube = np.full(
+            (ALL_MONTHS + 1, ALL_WEEKDAYS + 1, MINUTES,
+             len(PERCENTILE_NAMES), len(PERCENTILES)),
+            np.nan, dtype=f32
+        )
+        self.days = dict()
+        self.dirty = set()
+
+    def _load(self) -> None:
+        self._reset()
+        if not os.path.isfile(self.name):
+            return
+
+        logger.info(f'Reading percentiles from "{self.name}"')
+        try:
+            with np.load(self.name, allow_pickle=False) as store:
+                if ((store['NAMES'].tolist() != PERCENTILE_NAMES) or
+                    (store['PERCENTILES'].tolist() != PERCENTILES)):
+                    logger.warning(f'Incompatible percentiles "{self.name}"')
+                    return
+                cube = store['CUBE']
+                days = dict(zip(store['LOGDAY'].tolist(), store['MTIME'].tolist()))
+                dirty = set(map(tuple, store['DIRTY'].tolist()))
+        except Exception:
+            logger.error(f'Erroneous percentiles "{self.name}"')
+            return
+
+        self.cube, self.days, self.dirty = cube, days, dirty
+
+    """ Return the closed logdays whose groups are to be calculated
+    again """
+    def get_changed(self, logdays: strings, mtimes: List[int]) -> strings:
+        with self.lock:
+            if self.days is None:
+                self._load()
+            days = dict(zip(logdays, mtimes))
+            return sorted(
+                [ld for ld, mt in days.items() if self.days.get(ld) != mt] +
+                [ld for ld in self.days if ld not in days]
+            )
+
+    """ Calculate the group again from the values of the days in the
+    groups. The lock must be held """
+    def _calculate(
+            self,
+            month: int,
+            weekday: int,
+            values: np.ndarray,
+            groups: np.ndarray
+    ) -> None:
+        rows = np.flatnonzero(
+            ((groups[:,0] == month) | (month == ALL_MONTHS)) &
+            ((groups[:,1] == weekday) | (weekday == ALL_WEEKDAYS))
+        )
+        if rows.size == 0:
+            self.cube[month, weekday] = np.nan
+        else:
+            self.cube[month, weekday] = _get_percentiles(values[rows])
+        self.dirty.discard((month, weekday))
+
+    """ Calculate the groups of the changed logdays again from the grids
+    of the days with samples. The groups over all months or weekdays
+    are only marked as changed. The logdays are all closed logdays """
+    def update(
+            self,
+            changed: strings,
+            days: strings,
+            grids: np.ndarray,
+            logdays: strings,
+            mtimes: List[int]
+    ) -> None:
+        values, groups = _get_values(days, grids)
+
+        with self.lock:
+            if self.days is None:
+                self._load()
+            for m, w in sorted({_get_group(ld) for ld in changed}):
+                self._calculate(m, w, values, groups)
+                self.dirty |= {(m, ALL_WEEKDAYS), (ALL_MONTHS, w), (ALL_MONTHS, ALL_WEEKDAYS)}
+            self.days = dict(zip(logdays, mtimes))
+
+    """ Return the closed logdays if the group has changed since it was
+    calculated. None otherwise """
+    def get_dirty(self, month: int, weekday: int) -> strings:
+        with self.lock:
+            if self.days is None:
+                self._load()
+            if (month, weekday) not in self.dirty:
+                return None
+            return sorted(self.days)
+
+    """ Calculate the changed group from the grids of all closed days
+    with samples """
+    def update_group(
+            self,
+            month: int,
+            weekday: int,
+            days: strings,
+            grids: np.ndarray
+    ) -> None:
+        values, groups = _get_values(days, grids)
+
+        with self.lock:
+            self._calculate(month, weekday, values, groups)
+
+    """ Return the percentiles of the column in the minutes """
+    def get(
+            self,
+            month: int,
+            weekday: int,
+            name: str,
+            percentile: int,
+            minutes: np.ndarray
+    ) -> np.ndarray:
+        with self.lock:
+            if self.days is None:
+                self._load()
+            return self.cube[
+                month, weekday, minutes,
+                PERCENTILE_NAMES.index(name), PERCENTILES.index(percentile)
+            ].astype(f64)
+
+    """ Save the cube. The write is atomic """
+    def save(self) -> bool:
+        with self.lock:
+            logdays = sorted(self.days)
+            mtimes = np.array([self.days[ld] for ld in logdays], dtype=np.int64)
+            dirty = np.array(sorted(self.dirty), dtype=np.int64).reshape(-1, 2)
+            cube = self.cube.copy()
+
+        tempname = None
+        logger.info(f'Writing percentiles to "{self.name}"')
+        try:
+            fd, tempname = tempfile.mkstemp(
+                suffix='.tmp', dir=os.path.dirname(self.name) or '.'
+            )
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    LOGDAY=np.array(logdays, dtype=str),
+                    MTIME=mtimes,
+                    NAMES=np.array(PERCENTILE_NAMES, dtype=str),
+                    PERCENTILES=np.array(PERCENTILES, dtype=np.int64),
+                    DIRTY=dirty,
+                    CUBE=cube
+                )
+            os.replace(tempname, self.name)
+        except OSError:
+            logger.warning(f'Cannot write percentiles "{self.name}"')
+            if tempname is not None and os.path.isfile(tempname):
+                os.remove(tempname)
+            return False
+
+        return True
+
+
+CUBES = dict()
+CUBES_LOCK = threading.Lock()
+
+""" Return the cube for the log files with prefix in the directory """
+def _get_percentile_cube(
+        logprefix: str,
+        logdir: str
+) -> PercentileCube:
+    key = (logdir, logprefix)
+    with CUBES_LOCK:
+        if key not in CUBES:
+            CUBES[key] = PercentileCube(logprefix, logdir)
+        return CUBES[key]
+
+
+""" Bring the cube up to date with the closed logdays. Returns the
+number of new or changed logdays """
+async def update_load_percentiles(
+        logprefix: str,
+        logdir: str
+) -> int:
+
+    cube = _get_percentile_cube(logprefix, logdir)
+    today = ymd_today()
+
+    logdays = [ld for ld in await get_logdays(logprefix, logdir, '*') if ld < today]
+    mtimes = await get_logmtimes(logdays, logprefix, logdir)
+
+    changed = cube.get_changed(logdays, mtimes)
+    if len(changed) == 0:
+        return 0
+
+    logger.info(f'Updating percentiles for "{len(changed)}" days')
+    days, grids, _ = await get_archive_logs(logdays, logprefix, logdir)
+
+    if sys.version_info >= (3, 9):
+        await asyncio.to_thread(
+            cube.update, changed, days, grids, logdays, mtimes
+        )
+        await asyncio.to_thread(cube.save)
+    else:
+        cube.update(changed, days, grids, logdays, mtimes)
+        cube.save()
+
+    return len(changed)
+
+
+""" Return the percentile of the column for each minute from 'start' to
+'stop' with the minutes as 'HH:MM' index. A 'stop' before 'start' spans
+midnight. Month 1..12 and weekday 0..6 (Monday is 0) select a group,
+None selects all. Returns None for an unknown column or percentile. """
+async def get_load_percentiles(
+        logprefix: str,
+        logdir: str,
+        name: str = 'SMP',
+        percentile: int = 90,
+        month: int = None,
+        weekday: int = None,
+        start: str = '00:00',
+        stop: str = '24:00'
+) -> Series:
+
+    if (name not in PERCENTILE_NAMES) or (percentile not in PERCENTILES):
+        logger.error(f'No percentile "{percentile}" of "{name}"')
+        return None
+
+    await update_load_percentiles(logprefix, logdir)
+
+    cube = _get_percentile_cube(logprefix, logdir)
+    group = (ALL_MONTHS if month is None else month - 1,
+             ALL_WEEKDAYS if weekday is None else weekday)
+
+    logdays = cube.get_dirty(*group)
+    if logdays is not None:
+        logger.info(f'Updating percentiles of group "{group}"')
+        days, grids, _ = await get_archive_logs(logdays, logprefix, logdir)
+        if sys.version_info >= (3, 9):
+            await asyncio.to_thread(cube.update_group, *group, days, grids)
+            await asyncio.to_thread(cube.save)
+        else:
+            cube.update_group(*group, days, grids)
+            cube.save()
+
+    first, last = _get_minute(start), _get_minute(stop)
+    minutes = np.arange(first, last if last > first else last + MINUTES) % MINUTES
+
+    values = cube.get(
+        *group,
+        name,
+        percentile,
+        minutes
+    )
+    return Series(
+        values,
+        index=[f'{m//60:02d}:{m%60:02d}' for m in minutes],
+        name=f'{name}_P{percentile}'
+    )
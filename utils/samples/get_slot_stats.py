@@ -0,0 +1,100 @@
+__doc__=""" Statistics of the samples in time slots of the day over many
+logdays. The samples come from the minute archive. The minutes are
+binned into the slots once and reduced for all days and columns in one
+go. Minutes without samples are skipped.
+"""
+__version__ = "0.0.0"
+__author__ = "r09491@gmail.com"
+
+import logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s.%(msecs)03d %(levelname)s %(module)s: %(message)s',
+    datefmt='%H:%M:%S',)
+logger = logging.getLogger(__name__)
+
+import sys
+import asyncio
+
+import numpy as np
+
+from ..typing import(
+    f64, strings
+)
+from ..csvlog import(
+    get_archive_logs
+)
+from ..csvlog.logarchive import(
+    ARCHIVE_NAMES
+)
+from pandas import(
+    DataFrame,
+    concat
+)
+
+
+""" Return the minute of the day of 'HH:MM' """
+def _get_minute(
+        hm: str
+) -> int:
+    hours, minutes = hm.split(':')
+    return int(hours)*60 + int(minutes)
+
+
+""" Reduce the grids of the days to the mean, max and std of the
+columns in the slots. The slot i spans the minutes from times[i] to
+times[i+1] without the last one. """
+def _get_slot_stats(
+        grids: np.ndarray,
+        times: strings,
+        names: strings
+) -> DataFrame:
+    bounds = np.array([_get_minute(t) for t in times])
+    offsets = bounds[:-1] - bounds[0]
+
+    values = grids[:, bounds[0]:bounds[-1], [ARCHIVE_NAMES.index(n) for n in names]]
+    isvalid = ~np.isnan(values)
+    samples = np.where(isvalid, values, 0).astype(f64)
+
+    counts = np.add.reduceat(isvalid, offsets, axis=1, dtype=np.int64).sum(axis=0)
+    sums = np.add.reduceat(samples, offsets, axis=1).sum(axis=0)
+    squares = np.add.reduceat(samples*samples, offsets, axis=1).sum(axis=0)
+    maxs = np.fmax.reduce(np.fmax.reduceat(values, offsets, axis=1), axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = sums / counts
+        stds = np.sqrt(np.maximum(squares - sums*means, 0) / (counts - 1))
+    stds[counts < 2] = np.nan
+
+    index = times[:-1]
+    return concat([
+        DataFrame(means, index=index, columns=names).add_suffix('_mean'),
+        DataFrame(maxs.astype(f64), index=index, columns=names).add_suffix('_max'),
+        DataFrame(stds, index=index, columns=names).add_suffix('_std')
+    ], axis=1)
+
+
+""" Return the mean, max and std of the columns in the slots over all
+logdays. The slots start at the times 'HH:MM' in increasing order. The
+last time ends the last slot. Returns None without samples. """
+async def get_slot_stats(
+        logdays: strings,
+        times: strings,
+        logprefix: str,
+        logdir: str,
+        names: strings = ['SBPI', 'SMP']
+) -> DataFrame:
+
+    if (len(times) < 2) or (np.diff([_get_minute(t) for t in times]) <= 0).any():
+        logger.error(f'Slot times must increase "{times}"')
+        return None
+
+    days, grids, _ = await get_archive_logs(logdays, logprefix, logdir)
+    if len(days) == 0:
+        logger.error(f'No samples for the logdays')
+        return None
+
+    logger.info(f'Slot statistics over "{len(days)}" days')
+    if sys.version_info >= (3, 9):
+        return await asyncio.to_thread(_get_slot_stats, grids, times, names)
+    return _get_slot_stats(grids, times, names)
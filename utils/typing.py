@@ -3,9 +3,10 @@ import sys
 import numpy as np
 
 if sys.version_info >= (3, 9):
-    from typing import Any, List, Optional, Dict
+    from typing import Any, List, Optional, Dict, AsyncIterator
     from numpy.typing import NDArray # mypy Crash!"
     
+    f32 = np.float32
     f64 = np.float64
     f64s = NDArray[f64]
 
@@ -13,8 +14,9 @@ if sys.version_info >= (3, 9):
     t64s = NDArray[t64]
 
 else:
-    from typing import Any, List, Optional, Dict
+    from typing import Any, List, Optional, Dict, AsyncIterator
 
+    f32 = np.float32
     f64 = np.float64
     f64s = np.array
 